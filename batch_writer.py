@@ -0,0 +1,97 @@
+# batch_writer.py
+# Background thread that drains a queue in batches, shared by the game log and the stats store
+import queue
+import sys
+import threading
+import time
+
+ALIVE_CHECK = 0.1  # Seconds between checks that the thread a flush waits on is still running
+
+
+class BatchWriter:
+    """Hands queued tuples to write_batch on its own thread, every batch_size items or flush_interval seconds.
+    on_open and on_close run on that thread too, for sinks (like SQLite connections) tied to their thread"""
+
+    def __init__(self, name, write_batch, batch_size, flush_interval, on_open=None, on_close=None):
+        self.name = name
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_open = on_open
+        self.on_close = on_close
+        self.queue = queue.Queue()
+        self.thread = None  # Started by the first put, again after close
+        self.lock = threading.Lock()
+        self.dropped = 0  # Items lost to errors from the sink
+        self.error = None  # The last of those errors
+
+    def put(self, item):
+        """Queues an item, never waits for the sink"""
+        self._ensure_thread()
+        self.queue.put(item)
+
+    def flush(self):
+        """Blocks until every item queued so far is written or dropped; False if the thread is gone"""
+        thread = self.thread
+        if thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        while not done.wait(ALIVE_CHECK):
+            if not thread.is_alive():
+                return False
+        return True
+
+    def close(self):
+        """Writes what is queued and stops the thread"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self):
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self.thread.start()
+
+    def _call(self, function, *args):
+        """Runs a sink callback; an error is reported instead of killing the thread. Returns True on success"""
+        try:
+            function(*args)
+            return True
+        except Exception as error:
+            self.error = error
+            print(f"{self.name}: {error!r}", file=sys.stderr)
+            return False
+
+    def _run(self):
+        opened = self.on_open is None or self._call(self.on_open)
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()  # Flush interval elapsed
+            if isinstance(item, tuple) and item:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+                if len(batch) < self.batch_size:
+                    continue
+            if batch:
+                # A failed open is retried with each batch, so the sink recovers once the cause goes away
+                opened = opened or self._call(self.on_open)
+                if not (opened and self._call(self.write_batch, batch)):
+                    self.dropped += len(batch)
+            batch = []
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                break
+        if opened and self.on_close:
+            self._call(self.on_close)
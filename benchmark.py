@@ -0,0 +1,184 @@
+# benchmark.py
+# Headless frame-time and latency benchmarks for HangmanApp, compared against a stored baseline
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+START = time.perf_counter()
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+TOLERANCE = 0.20  # Median may be this much slower than the baseline before it counts as a regression
+SCREENS = ["menu", "categories", "difficulty", "game"]
+
+
+def summarize(samples):
+    """Seconds in, milliseconds out"""
+    samples = sorted(sample * 1e3 for sample in samples)
+    return {
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min_ms": samples[0],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "samples": len(samples),
+    }
+
+
+def first_frame():
+    """Runs in a fresh process: time from interpreter start of this script to the first flip"""
+    import categorized_code
+    categorized_code.LOG_FILE = os.devnull
+    categorized_code.STATS_FILE = ":memory:"
+    app = categorized_code.HangmanApp()
+    app.render()
+    print(time.perf_counter() - START)
+
+
+# --- Benchmarks ---
+class AppBenchmark:
+    def __init__(self, repeats, frames):
+        import pygame
+        import categorized_code
+        categorized_code.LOG_FILE = os.devnull  # Keep benchmark guesses out of the real log
+        categorized_code.STATS_FILE = ":memory:"  # ... and benchmark games out of the stats database
+        self.pygame = pygame
+        self.cc = categorized_code
+        self.app = categorized_code.HangmanApp()
+        self.repeats = repeats
+        self.frames = frames
+
+    def show(self, screen):
+        app = self.app
+        if screen == "game":
+            app.selected_category = "words"
+            app.select_difficulty("medium")
+        else:
+            app.current_screen = screen
+            app.switch_scene()
+
+    def time_to_first_frame(self):
+        samples = []
+        for _ in range(self.repeats):
+            result = subprocess.run([sys.executable, os.path.abspath(__file__), "--first-frame"],
+                                    capture_output=True, text=True, check=True)
+            samples.append(float(result.stdout.strip().splitlines()[-1]))
+        return summarize(samples)
+
+    def draw(self, screen):
+        """Full redraw and flip of one screen, as on a screen transition"""
+        self.show(screen)
+        app = self.app
+        samples = []
+        for _ in range(self.repeats):
+            for _ in range(self.frames):
+                start = time.perf_counter()
+                app.draw_screen()
+                self.pygame.display.flip()
+                samples.append(time.perf_counter() - start)
+        return summarize(samples)
+
+    def guess_latency(self):
+        """HangmanGame.guess from a key press to the updated state"""
+        self.show("game")
+        game = self.app.game
+        samples = []
+        for _ in range(self.repeats * self.frames // 10):
+            game.reset_game()
+            for letter in "etaoinshrdlu":
+                if game.has_won() or game.has_lost():
+                    break
+                start = time.perf_counter()
+                game.guess(letter)
+                samples.append(time.perf_counter() - start)
+        return summarize(samples)
+
+    def select_difficulty(self):
+        app = self.app
+        app.selected_category = "riddle"
+        samples = []
+        for _ in range(self.repeats * 10):
+            for difficulty in ("easy", "medium", "hard"):
+                app.current_screen = "difficulty"
+                app.switch_scene()
+                start = time.perf_counter()
+                app.select_difficulty(difficulty)
+                samples.append(time.perf_counter() - start)
+        return summarize(samples)
+
+    def run(self):
+        results = {"time_to_first_frame": self.time_to_first_frame()}
+        for screen in SCREENS:
+            results[f"draw_{screen}"] = self.draw(screen)
+        results["guess_latency"] = self.guess_latency()
+        results["select_difficulty"] = self.select_difficulty()
+        return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Returns the names of benchmarks whose median regressed past the tolerance"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        change = stats["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        flag = "REGRESSION" if change > tolerance else ""
+        print(f"  {name:<22} {base['median_ms']:>9.3f} -> {stats['median_ms']:>9.3f} ms  {change:+7.1%} {flag}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HangmanApp under SDL's dummy drivers")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=100, help="Frames timed per repeat")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline")
+    parser.add_argument("--first-frame", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.first_frame:
+        first_frame()
+        return 0
+
+    results = AppBenchmark(args.repeats, args.frames).run()
+    for name, stats in results.items():
+        print(f"{name:<22} median={stats['median_ms']:.3f}ms p99={stats['p99_ms']:.3f}ms "
+              f"stdev={stats['stdev_ms']:.3f}ms n={stats['samples']}")
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeats": args.repeats,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nAgainst baseline from {baseline['created']}:")
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+# calibrate.py
+# Scores every corpus entry by simulated solver effort across a process pool and writes a difficulty table
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import time
+from collections import Counter
+from hangman_engine import DIFFICULTY_TABLE, MAX_TRIES, TABLE_VERSION, GameState, HangmanEngine
+from letter_solver import LetterSolver
+from word_corpus import CORPUS_INDEX, DIFFICULTIES, CorpusIndex
+
+CHUNK_SIZE = 2_000  # Entries per task handed to a worker
+# How much each normalized metric contributes to the score
+WEIGHTS = {"wrong": 0.6, "ambiguity": 0.25, "entropy": 0.15}
+MAX_ENTROPY = 8.0  # Bits of letter surprisal that count as maximally obscure
+POOL_DRIFT = 0.10  # Rescore a whole category once its pool grew or shrank by more than this
+SOLVER_CACHE = 200_000  # (pattern, guessed) results memoized per category in each worker
+ENGLISH_ORDER = "etaoinshrdlcumwfgypbvkjxqz"  # Fallback once the solver runs out of candidates
+
+
+def category_pools(index):
+    """{category: [unique answers]} over every difficulty; the hint tells the player the category"""
+    pools = {}
+    for category, groups in index.groups.items():
+        answers = dict.fromkeys(index.entry(entry_id)[1]
+                                for first, count in groups.values() for entry_id in range(first, first + count))
+        pools[category] = list(answers)
+    return pools
+
+
+# --- Worker Process ---
+_worker = {}
+
+
+def init_worker(pools):
+    _worker["pools"] = pools
+    _worker["solvers"] = {}
+
+
+def category_model(category):
+    """LetterSolver, letter probabilities and move cache for a category, built on first use"""
+    model = _worker["solvers"].get(category)
+    if model is None:
+        pool = _worker["pools"][category]
+        counts = Counter(letter for answer in pool for letter in set(answer) if "a" <= letter <= "z")
+        probabilities = {letter: count / len(pool) for letter, count in counts.items()}
+        model = _worker["solvers"][category] = (LetterSolver(pool), probabilities, {})
+    return model
+
+
+def letter_entropy(answer, probabilities):
+    """Mean surprisal in bits of the answer's distinct letters under the category's letter frequencies"""
+    letters = {letter for letter in answer if "a" <= letter <= "z"}
+    if not letters:
+        return 0.0
+    return sum(-math.log2(probabilities[letter]) for letter in letters) / len(letters)
+
+
+def solve(answer, solver, cache):
+    """Plays the answer with the greedy solver; returns (wrong guesses, mean log2 candidates per turn)"""
+    state = GameState(answer)
+    ambiguity = []
+    while not (state.has_won() or state.has_lost()):
+        key = ("".join(state.chars), state.guessed)
+        move = cache.get(key)
+        if move is None:
+            move = solver.analyze(*key)
+            if len(cache) < SOLVER_CACHE:
+                cache[key] = move
+        letter, remaining = move
+        if letter is None:
+            letter = next(letter for letter in ENGLISH_ORDER if letter not in state.guessed)
+        ambiguity.append(math.log2(max(remaining, 1)))
+        state.guess(letter)
+    return state.wrong, sum(ambiguity) / len(ambiguity)
+
+
+def score_chunk(task):
+    """[(category, answer)] -> [(category, answer, wrong, ambiguity, entropy)]"""
+    results = []
+    for category, answer in task:
+        solver, probabilities, cache = category_model(category)
+        wrong, ambiguity = solve(answer, solver, cache)
+        results.append((category, answer, wrong, ambiguity, letter_entropy(answer, probabilities)))
+    return results
+
+
+# --- Calibration ---
+def combined_score(wrong, ambiguity, entropy, pool_size):
+    """0 (trivial) to 1 (hardest) from the three raw metrics"""
+    return (WEIGHTS["wrong"] * wrong / MAX_TRIES +
+            WEIGHTS["ambiguity"] * ambiguity / max(math.log2(pool_size), 1.0) +
+            WEIGHTS["entropy"] * min(entropy / MAX_ENTROPY, 1.0))
+
+
+def bucket(scores, shares):
+    """Assigns difficulties by score rank, keeping each difficulty's share of the category"""
+    ranked = sorted(scores, key=lambda answer: (scores[answer], answer))
+    total = sum(shares.values()) or 1
+    levels = {}
+    start = 0
+    for i, difficulty in enumerate(DIFFICULTIES):
+        end = len(ranked) if i == len(DIFFICULTIES) - 1 else start + round(len(ranked) * shares.get(difficulty, 0) / total)
+        for answer in ranked[start:end]:
+            levels[answer] = difficulty
+        start = end
+    return levels
+
+
+class Calibrator:
+    def __init__(self, index_path=CORPUS_INDEX, table_path=DIFFICULTY_TABLE, workers=None):
+        if index_path == CORPUS_INDEX:
+            HangmanEngine.load_words()  # Builds the index if it is missing or stale
+        self.index = CorpusIndex(index_path)
+        self.table_path = table_path
+        self.workers = workers or os.cpu_count()
+        self.pools = category_pools(self.index)
+        self.rescored = 0
+        self.reused = 0
+
+    def cached_metrics(self, rescore=False):
+        """{category: {answer: (wrong, ambiguity, entropy)}} from the previous table still worth keeping"""
+        if rescore or not os.path.exists(self.table_path):
+            return {}
+        try:
+            with open(self.table_path) as f:
+                previous = json.load(f)
+        except ValueError:  # Not readable as JSON: score everything again
+            return {}
+        if not isinstance(previous, dict) or previous.get("version") != TABLE_VERSION:
+            return {}
+        cached = {}
+        for category, info in previous["categories"].items():
+            pool = self.pools.get(category)
+            if pool is None or abs(len(pool) - info["pool"]) > POOL_DRIFT * info["pool"]:
+                continue  # Scores depend on the rest of the pool, which changed too much
+            cached[category] = {answer: tuple(entry[:3]) for answer, entry in info["entries"].items()}
+        return cached
+
+    def run(self, rescore=False, chunk_size=CHUNK_SIZE):
+        """Scores new or changed entries on the pool, writes the table, returns it"""
+        metrics = self.cached_metrics(rescore)
+        todo = []
+        for category, pool in self.pools.items():
+            known = metrics.setdefault(category, {})
+            for answer in list(known):
+                if answer not in pool:
+                    del known[answer]
+            todo.extend((category, answer) for answer in pool if answer not in known)
+        self.reused = sum(len(known) for known in metrics.values())
+        self.rescored = len(todo)
+        tasks = [todo[start:start + chunk_size] for start in range(0, len(todo), chunk_size)]
+        if tasks:
+            with multiprocessing.Pool(self.workers, init_worker, (self.pools,)) as pool:
+                for results in pool.imap_unordered(score_chunk, tasks):
+                    for category, answer, *values in results:
+                        metrics[category][answer] = tuple(values)
+        return self.write(metrics)
+
+    def write(self, metrics):
+        table = {"version": TABLE_VERSION, "weights": WEIGHTS, "categories": {}}
+        for category, entries in sorted(metrics.items()):
+            groups = self.index.groups[category]
+            pool_size = len(self.pools[category])
+            scores = {answer: combined_score(*values, pool_size) for answer, values in entries.items()}
+            levels = bucket(scores, {difficulty: count for difficulty, (_, count) in groups.items()})
+            table["categories"][category] = {
+                "pool": pool_size,
+                # answer -> [wrong guesses, ambiguity bits, entropy bits, score, difficulty]
+                "entries": {answer: [*(round(value, 4) for value in entries[answer]), round(scores[answer], 4),
+                                     levels[answer]] for answer in sorted(entries)},
+            }
+        tmp_path = self.table_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(table, f, indent=1)
+        os.replace(tmp_path, self.table_path)  # An interrupted run leaves the previous table intact
+        return table
+
+    def moves(self, table):
+        """(category, answer, hand-assigned difficulty, calibrated difficulty, score) for relabelled entries"""
+        moved = []
+        for category, groups in self.index.groups.items():
+            entries = table["categories"][category]["entries"]
+            for difficulty, (first, count) in groups.items():
+                for entry_id in range(first, first + count):
+                    answer = self.index.entry(entry_id)[1]
+                    score, calibrated = entries[answer][3:]
+                    if calibrated != difficulty:
+                        moved.append((category, answer, difficulty, calibrated, score))
+        return moved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate word difficulty by simulated solver effort")
+    parser.add_argument("--index", default=CORPUS_INDEX)
+    parser.add_argument("--output", default=DIFFICULTY_TABLE)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--rescore", action="store_true", help="Ignore cached scores from the previous table")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    calibrator = Calibrator(args.index, args.output, args.workers)
+    start = time.perf_counter()
+    table = calibrator.run(args.rescore)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {calibrator.rescored} entries, reused {calibrator.reused} in {elapsed:.2f}s "
+          f"on {calibrator.workers} workers -> {args.output}")
+    moved = calibrator.moves(table)
+    order = {difficulty: i for i, difficulty in enumerate(DIFFICULTIES)}
+    print(f"{len(moved)} entries change difficulty; the biggest moves:")
+    moved.sort(key=lambda move: -abs(order[move[3]] - order[move[2]]))
+    for category, answer, before, after, score in moved[:args.top]:
+        print(f"  {answer:<20} {category:<8} {before:>6} -> {after:<6} score={score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,29 @@
 # hangman_oop_game.py
+import time
+IMPORT_STARTED = time.perf_counter()  # Start of the startup timeline
 import pygame
-import random
 import json
 import os
+import sys
+import atexit
+import csv
+import random
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from datetime import datetime
+from batch_writer import BatchWriter
+from hangman_engine import (MAX_TRIES, HangmanEngine, RandomCategoryStrategy, ShuffleBagStrategy,
+                            load_difficulty_table, select_answers)
+from replay import RECORD_ENV, ReplayWriter, session_seed
+from sprite_atlas import SPRITES, best_scale, load_page
+from stats_store import StatsStore
+from word_corpus import CorpusIndex
+
+try:
+    from letter_solver import LetterSolver
+except ImportError:  # NumPy is optional, the game just has no hint button without it
+    LetterSolver = None
 
 # Constants
 WIDTH, HEIGHT = 800, 600
@@ -21,12 +40,65 @@ FONT_NAME = os.path.join("fonts", "Jersey10-Regular.ttf")
 FONT_SIZE = 30
 TITLE_FONT_SIZE = 50
 MENU_TITLE_FONT_SIZE = 100
-MAX_TRIES = 6
-# Add with other constants
-SOUND_ON_ICON = "assets1/sound_on.jpg"
-SOUND_OFF_ICON = "assets1/sound_off.jpg"
-# Add with other constants
-BACK_ARROW_ICON = "assets1/back_arrow.png"  # Create a dark purple arrow image (30x30px)
+LOG_FILE = "game_log.txt"
+LOG_FORMAT = "text"  # "text" for "[timestamp] message" lines, "jsonl" for JSON Lines
+LOG_BATCH_SIZE = 64  # Records written per batch
+LOG_FLUSH_INTERVAL = 1.0  # Seconds a record may wait before being flushed
+LOG_MAX_BYTES = 1_000_000  # Rotate the log file past this size
+LOG_BACKUP_COUNT = 5  # Rotated files kept as game_log.txt.1 ... game_log.txt.5
+STATS_FILE = "game_stats.db"  # SQLite database of finished games, see stats_store.py
+# Sprites are names in sprite_atlas.SPRITES, drawn from atlas pages built from the assets1 images
+SOUND_ON_ICON = "sound_on"
+SOUND_OFF_ICON = "sound_off"
+BACK_ARROW_ICON = "back_arrow"  # Dark purple arrow (30x30px)
+ATLAS_SCALE = best_scale((WIDTH, HEIGHT))  # Pre-scaled atlas variant matching the window
+BACKGROUND_MUSIC = "assets1/sounds/background.wav"
+TIMELINE_ENV = "HANGMAN_TIMELINE"  # Set to a file path to write the startup timeline there once loaded
+PROFILE_ENV = "HANGMAN_PROFILE"  # Set to 1 to start with the frame profiler and overlay on (F3 toggles)
+PROFILE_TRACE_ENV = "HANGMAN_PROFILE_TRACE"  # .csv or .json path for the frame trace (F4 or exit writes it)
+PROFILE_WINDOW = 300  # Frames kept for the rolling percentiles
+PROFILE_TRACE_FRAMES = 10_000  # Frames kept for the exported trace
+PROFILE_BUCKETS_MS = [0.25, 0.5, 1, 2, 4, 8, 16, 33, 66]  # Histogram bucket upper bounds
+OVERLAY_RECT = (10, 45, 260, 72)
+OVERLAY_FONT_SIZE = 22
+TEXT_CACHE_SIZE = 256  # Max rendered text surfaces kept around
+FPS = 30
+DIRTY_RENDERING = True  # Only push changed regions to the display
+IDLE_WAIT_MS = 500  # How long the loop sleeps waiting for input when nothing animates
+HANGMAN_POS = (-5, -100)
+GAME_STATUS_RECT = (0, 340, WIDTH, HEIGHT - 340)  # Win/lose message, hint, word, guesses, restart
+HIT_CELL = 64  # Side of a hit-test grid cell in pixels
+# Input a session recording keeps; window and focus events do not affect the game
+RECORDED_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+HINT_READY = pygame.event.custom_type()  # Posted by the thread that built a hint solver
+CLICK_SOUND = "assets1/sounds/click.wav"
+# Audio: effects share one decoded buffer each and play through a fixed channel pool
+AUDIO_CHANNELS = 6
+LOW_MEMORY_AUDIO = os.environ.get("HANGMAN_LOW_MEMORY_AUDIO") == "1"
+# Mixer format effects are decoded into; low-memory mode keeps a quarter of the bytes
+MIXER_FREQUENCY = 22050 if LOW_MEMORY_AUDIO else 44100
+MIXER_CHANNELS = 1 if LOW_MEMORY_AUDIO else 2
+PRIORITY_UI = 1  # Button clicks
+PRIORITY_FEEDBACK = 2  # Correct/wrong guess
+PRIORITY_RESULT = 3  # Win/lose
+HANGMAN_IMAGES = [f"hangman{i}" for i in range(MAX_TRIES + 1)]
+WIN_FRAMES = [f"win_{i}" for i in range(2)]
+# Only what the menu screen draws or plays, loaded before the first frame: atlas pages, images as
+# (path, size, alpha), and sounds
+MENU_MANIFEST = {
+    "atlas": ["ui"],  # Sound and back icons
+    "sounds": [CLICK_SOUND],
+}
+# Everything else, loaded on a background thread once the menu is up
+ASSET_MANIFEST = {
+    "atlas": ["game"],  # Hangman stages and win frames
+    "sounds": [
+        "assets1/sounds/correct.wav",
+        "assets1/sounds/wrong.wav",
+        "assets1/sounds/win.wav",
+        "assets1/sounds/lose.wav",
+    ],
+}
 
 
 # --- Logger Singleton ---
@@ -36,41 +108,498 @@ class Logger:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Logger, cls).__new__(cls)
-            cls._instance.log_file = open("game_log.txt", "a")
+            cls._instance.path = LOG_FILE
+            cls._instance.format = LOG_FORMAT
+            cls._instance.log_file = None
+            cls._instance.writer = BatchWriter("Logger", cls._instance._write_batch, LOG_BATCH_SIZE,
+                                               LOG_FLUSH_INTERVAL, cls._instance._open, cls._instance._close)
+            atexit.register(cls._instance.close)
         return cls._instance
 
-    def log(self, message):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log_file.write(f"[{timestamp}] {message}\n")
+    def log(self, message, **fields):
+        """Queues a record for the background writer, never touches the disk"""
+        self.writer.put((datetime.now(), message, fields))
+
+    def flush(self):
+        """Blocks until every record queued so far is on disk (or dropped, see BatchWriter.flush)"""
+        return self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+    def _format(self, timestamp, message, fields):
+        if self.format == "jsonl":
+            record = {"time": timestamp.isoformat(timespec="seconds"), "message": message}
+            record.update(fields)
+            return json.dumps(record) + "\n"
+        return f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+
+    def _open(self):
+        self.log_file = open(self.path, "a")
 
-    def __del__(self):
+    def _close(self):
         self.log_file.close()
+        self.log_file = None
 
+    def _write_batch(self, batch):
+        data = "".join(self._format(*record) for record in batch)
+        if self.log_file.tell() and self.log_file.tell() + len(data) > LOG_MAX_BYTES:
+            self._rotate()
+        self.log_file.write(data)
+        self.log_file.flush()
 
-# --- Strategy Pattern ---
-class WordStrategy(ABC):
-    @abstractmethod
-    def select_word(self, word_data):
-        pass
+    def _rotate(self):
+        self.log_file.close()
+        for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if LOG_BACKUP_COUNT > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.log_file = open(self.path, "a")
+
+
+# --- Font Registry Singleton ---
+class FontRegistry:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FontRegistry, cls).__new__(cls)
+            cls._instance.fonts = {}
+        return cls._instance
+
+    def get(self, name=FONT_NAME, size=FONT_SIZE):
+        """Returns a shared Font, loading it from disk only the first time"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+
+# --- Text Surface Cache Singleton ---
+class TextCache:
+    _instance = None
 
+    def __new__(cls, max_size=TEXT_CACHE_SIZE):
+        if cls._instance is None:
+            cls._instance = super(TextCache, cls).__new__(cls)
+            cls._instance.max_size = max_size
+            cls._instance.surfaces = OrderedDict()
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+            cls._instance.evictions = 0
+        return cls._instance
 
-class RandomCategoryStrategy(WordStrategy):
-    def __init__(self, selected_category=None, selected_difficulty=None):
-        self.selected_category = selected_category
-        self.selected_difficulty = selected_difficulty
+    def render(self, text, color, size=FONT_SIZE, font_name=FONT_NAME, antialias=True):
+        """Returns a rendered text surface, reusing it if the same text was drawn before"""
+        key = (font_name, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = FontRegistry().get(font_name, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Drop least recently used
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.surfaces),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# --- Startup Timeline ---
+class StartupTimeline:
+    """Start and end times of each startup step, in ms since the game module started importing"""
+
+    def __init__(self, origin=IMPORT_STARTED):
+        self.origin = origin
+        self.events = []  # (label, start ms, end ms, thread name)
+
+    def span(self, label, start, end=None):
+        end = time.perf_counter() if end is None else end
+        self.events.append((label, (start - self.origin) * 1e3, (end - self.origin) * 1e3,
+                            threading.current_thread().name))
+
+    def mark(self, label):
+        now = time.perf_counter()
+        self.span(label, now, now)
+
+    def dump(self, file=None):
+        """Writes the timeline as a table, or as JSON when file is a path"""
+        events = sorted(self.events, key=lambda event: event[1])
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                json.dump([{"label": label, "start_ms": start, "end_ms": end, "thread": thread}
+                           for label, start, end, thread in events], f, indent=2)
+            return
+        file = file or sys.stdout
+        print(f"{'start ms':>9} {'took ms':>8}  {'thread':<12} step", file=file)
+        for label, start, end, thread in events:
+            print(f"{start:>9.1f} {end - start:>8.1f}  {thread:<12} {label}", file=file)
+
+
+def audio_path(path):
+    """Prefers a compressed .ogg next to the requested file when one is shipped"""
+    ogg = os.path.splitext(path)[0] + ".ogg"
+    return ogg if os.path.exists(ogg) else path
+
+
+# --- Asset Manager Singleton ---
+class AssetManager:
+    _instance = None
 
-    def select_word(self, word_data):
-        if self.selected_category == "riddle":
-            difficulty = self.selected_difficulty or random.choice(["easy", "medium", "hard"])
-            riddle, answer = random.choice(word_data["riddle"][difficulty])
-            return "riddle", {"word": answer, "hint": riddle}
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AssetManager, cls).__new__(cls)
+            cls._instance.images = {}
+            cls._instance.sounds = {}
+            cls._instance.atlas = {}  # page name -> AtlasPage at ATLAS_SCALE
+            cls._instance.lock = threading.RLock()  # The background loader and the game share the caches
+            cls._instance.timeline = None
+        return cls._instance
+
+    def image(self, path, size=None, alpha=True):
+        """Returns a shared display-format surface, optionally pre-scaled to size"""
+        key = (path, size, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            with self.lock:
+                surface = self.images.get(key)
+                if surface is None:
+                    start = time.perf_counter()
+                    if size is not None:
+                        surface = pygame.transform.scale(self.image(path, None, alpha), size)
+                    else:
+                        surface = pygame.image.load(path)
+                        surface = surface.convert_alpha() if alpha else surface.convert()
+                    self.images[key] = surface
+                    if self.timeline:
+                        self.timeline.span(f"load {path}" + (f" @{size[0]}x{size[1]}" if size else ""), start)
+        return surface
+
+    def sound(self, path):
+        """Returns a shared Sound, decoding the file only the first time"""
+        sound = self.sounds.get(path)
+        if sound is None:
+            with self.lock:
+                sound = self.sounds.get(path)
+                if sound is None:
+                    start = time.perf_counter()
+                    sound = pygame.mixer.Sound(audio_path(path))
+                    self.sounds[path] = sound
+                    if self.timeline:
+                        self.timeline.span(f"load {path}", start)
+        return sound
+
+    def atlas_page(self, page):
+        """Returns a loaded atlas page, building the atlas first if it is missing or stale"""
+        atlas = self.atlas.get(page)
+        if atlas is None:
+            with self.lock:
+                atlas = self.atlas.get(page)
+                if atlas is None:
+                    start = time.perf_counter()
+                    atlas = load_page(page, ATLAS_SCALE)
+                    self.atlas[page] = atlas
+                    if self.timeline:
+                        self.timeline.span(f"atlas {page}@{ATLAS_SCALE:g}x", start)
+        return atlas
+
+    def sprite(self, name):
+        """Returns a Sprite from the atlas page that holds it"""
+        return self.atlas_page(SPRITES[name][0])[name]
+
+    def preload(self, manifest=ASSET_MANIFEST):
+        for page in manifest.get("atlas", []):
+            self.atlas_page(page)
+        for path, size, alpha in manifest.get("images", []):
+            self.image(path, size, alpha)
+        for path in manifest.get("sounds", []):
+            self.sound(path)
+
+    def memory_usage(self):
+        """Returns approximate resident bytes per loaded asset"""
+        usage = {f"atlas {page}": atlas.nbytes() for page, atlas in self.atlas.items()}
+        for (path, size, alpha), surface in self.images.items():
+            name = path if size is None else f"{path}@{size[0]}x{size[1]}"
+            usage[name] = surface.get_pitch() * surface.get_height()
+        mixer = pygame.mixer.get_init()
+        if mixer:
+            frequency, sample_format, channels = mixer
+            frame_bytes = abs(sample_format) // 8 * channels
+            for path, sound in self.sounds.items():
+                usage[path] = int(sound.get_length() * frequency) * frame_bytes
+        return usage
+
+
+# --- Audio Manager Singleton ---
+class AudioManager:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AudioManager, cls).__new__(cls)
+            cls._instance.channels = []
+            cls._instance.priorities = []
+            cls._instance.started = []
+            cls._instance.enabled = True
+            cls._instance.music_volume = 1.0
+        return cls._instance
+
+    def init(self, channels=AUDIO_CHANNELS):
+        """Sets up the channel pool, call after pygame.mixer.init"""
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.priorities = [0] * channels
+        self.started = [0] * channels
+
+    def effect(self, path, volume=1.0):
+        """Returns the shared decoded buffer for a sound effect"""
+        sound = AssetManager().sound(path)
+        sound.set_volume(volume)
+        return sound
+
+    def play(self, sound, priority=PRIORITY_FEEDBACK):
+        """Plays on a free channel, or steals the lowest-priority, oldest voice; returns the Channel or None"""
+        if not self.enabled or sound is None or not self.channels:
+            return None
+        index = next((i for i, channel in enumerate(self.channels) if not channel.get_busy()), None)
+        if index is None:
+            index = min(range(len(self.channels)), key=lambda i: (self.priorities[i], self.started[i]))
+            if self.priorities[index] > priority:
+                return None  # Every voice is more important than this one
+            self.channels[index].stop()
+        self.channels[index].play(sound)
+        self.priorities[index] = priority
+        self.started[index] = pygame.time.get_ticks()
+        return self.channels[index]
+
+    def play_music(self, path, loops=-1):
+        """Streams music from disk instead of decoding it into memory"""
+        pygame.mixer.music.load(audio_path(path))
+        pygame.mixer.music.set_volume(self.music_volume if self.enabled else 0.0)
+        pygame.mixer.music.play(loops)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        pygame.mixer.music.set_volume(self.music_volume if enabled else 0.0)
+        if not enabled:
+            for channel in self.channels:
+                channel.stop()
+
+    def resident_memory(self):
+        """Approximate bytes of decoded audio held in memory, per file"""
+        sounds = AssetManager().sounds
+        return {path: size for path, size in AssetManager().memory_usage().items() if path in sounds}
+
+
+# --- Frame Profiler ---
+class FrameProfiler:
+    """Times each phase of HangmanApp.run into rolling windows; every call returns at once when disabled"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = {}  # phase -> deque of recent durations in seconds
+        self.frame_times = deque(maxlen=PROFILE_WINDOW)  # Work per frame, waits excluded
+        self.frame_ends = deque(maxlen=PROFILE_WINDOW)
+        self.trace = deque(maxlen=PROFILE_TRACE_FRAMES)  # (frame, phase, start, duration)
+        self.frames = 0
+        self.current = {}
+        self.phase_name = None
+        self.phase_start = 0.0
+        self.last_overlay = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.phase_name = None
+
+    def begin_frame(self, phase):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.phase_name = phase
+        self.phase_start = time.perf_counter()
+
+    def phase(self, name):
+        """Ends the running phase and starts the next one"""
+        if not self.enabled or self.phase_name is None:
+            return
+        now = time.perf_counter()
+        self.current[self.phase_name] = self.current.get(self.phase_name, 0.0) + now - self.phase_start
+        self.phase_name = name
+        self.phase_start = now
+
+    def end_frame(self, rendered):
+        """Records the frame; loop passes that drew nothing are not frames"""
+        if not self.enabled or self.phase_name is None:
+            return
+        self.phase(None)
+        if not rendered:
+            return
+        self.frames += 1
+        end = time.perf_counter()
+        start = end - sum(self.current.values())
+        for name, duration in self.current.items():
+            self.phases.setdefault(name, deque(maxlen=PROFILE_WINDOW)).append(duration)
+            self.trace.append((self.frames, name, start, duration))
+        self.frame_times.append(sum(d for name, d in self.current.items() if name not in ("idle", "tick")))
+        self.frame_ends.append(end)
+
+    @staticmethod
+    def percentile(samples, fraction):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def fps(self):
+        if len(self.frame_ends) < 2:
+            return 0.0
+        recent = [end for end in self.frame_ends if end > self.frame_ends[-1] - 1.0]
+        return len(recent) if len(recent) > 1 else 1.0 / (self.frame_ends[-1] - self.frame_ends[-2])
+
+    def histogram(self, samples):
+        counts = [0] * (len(PROFILE_BUCKETS_MS) + 1)
+        for sample in samples:
+            ms = sample * 1e3
+            counts[next((i for i, bound in enumerate(PROFILE_BUCKETS_MS) if ms <= bound), -1)] += 1
+        return counts
+
+    def summary(self):
+        def stats(samples):
+            return {"p50_ms": self.percentile(samples, 0.5) * 1e3, "p99_ms": self.percentile(samples, 0.99) * 1e3,
+                    "histogram": self.histogram(samples)}
+
+        return {
+            "frames": self.frames,
+            "fps": self.fps(),
+            "frame": stats(self.frame_times),
+            "phases": {name: stats(samples) for name, samples in self.phases.items()},
+            "buckets_ms": PROFILE_BUCKETS_MS,
+            "text_cache": TextCache().stats(),
+        }
+
+    def overlay_due(self):
+        """True about once a second while enabled, so the overlay refreshes without forcing every frame"""
+        if not self.enabled:
+            return False
+        now = time.perf_counter()
+        if now - self.last_overlay >= 1.0:
+            self.last_overlay = now
+            return True
+        return False
+
+    def draw_overlay(self, surface):
+        if not self.enabled:
+            return
+        font = FontRegistry().get(FONT_NAME, OVERLAY_FONT_SIZE)
+        cache = TextCache().stats()
+        lines = [
+            f"FPS {self.fps():.0f}  frames {self.frames}",
+            f"frame p50 {self.percentile(self.frame_times, 0.5) * 1e3:.2f} ms"
+            f"  p99 {self.percentile(self.frame_times, 0.99) * 1e3:.2f} ms",
+            f"text cache hits {cache['hit_rate']:.0%} ({cache['size']} cached)",
+        ]
+        rect = pygame.Rect(OVERLAY_RECT)
+        pygame.draw.rect(surface, BLACK, rect)
+        for i, line in enumerate(lines):
+            # Rendered directly so the overlay doesn't skew the text cache statistics it shows
+            surface.blit(font.render(line, True, WHITE), (rect.x + 6, rect.y + 4 + i * 22))
+
+    def export(self, path):
+        """Writes the trace as CSV, or the trace plus summary as JSON, depending on the extension"""
+        origin = self.trace[0][2] if self.trace else 0.0
+        rows = [(frame, name, (start - origin) * 1e3, duration * 1e3) for frame, name, start, duration in self.trace]
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "phase", "frame_start_ms", "duration_ms"])
+                writer.writerows(rows)
         else:
-            # For "words" option, pick random category (animal/color/country/fruit)
-            word_categories = [cat for cat in word_data.keys() if cat != "riddle"]
-            category = random.choice(word_categories)
-            difficulty = self.selected_difficulty or random.choice(["easy", "medium", "hard"])
-            word = random.choice(word_data[category][difficulty])
-            return category, word.lower()  # category becomes the hint
+            with open(path, "w") as f:
+                json.dump({"summary": self.summary(),
+                           "trace": [{"frame": frame, "phase": name, "frame_start_ms": start, "duration_ms": duration}
+                                     for frame, name, start, duration in rows]}, f)
+
+
+# --- Layer Compositor ---
+class Compositor:
+    """Caches each screen's static layer so frames only redraw what changes on top of it"""
+
+    def __init__(self, size):
+        self.size = size
+        self.layers = {}  # screen name -> display-format surface
+        self.builds = 0
+
+    def layer(self, key, build):
+        """Returns the cached layer for key, calling build(surface) to paint it on a miss"""
+        surface = self.layers.get(key)
+        if surface is None:
+            surface = pygame.Surface(self.size).convert()
+            build(surface)
+            self.layers[key] = surface
+            self.builds += 1
+        return surface
+
+    def invalidate(self, key=None):
+        """Drops one cached layer, or all of them"""
+        if key is None:
+            self.layers.clear()
+        else:
+            self.layers.pop(key, None)
+
+
+# --- Background Asset Loader ---
+class AssetLoader:
+    """Preloads a manifest on a background thread; is_ready/wait report when it is done"""
+
+    def __init__(self, manifest=ASSET_MANIFEST, on_ready=None):
+        self.manifest = manifest
+        self.on_ready = on_ready
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._load, name="AssetLoader", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _load(self):
+        try:
+            AssetManager().preload(self.manifest)
+            if self.on_ready:
+                self.on_ready()
+        except Exception as error:  # Re-raised on the game thread by wait()
+            self.error = error
+        finally:
+            self.ready.set()
+
+    def is_ready(self):
+        return self.ready.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until loading finished, returns False on timeout"""
+        self.ready.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.ready.is_set()
 
 
 # --- GameEntity Base Class ---
@@ -82,6 +611,8 @@ class GameEntity(ABC):
 
 # --- Button ---
 class Button(GameEntity):
+    events = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
     def __init__(self, text, x, y, w, h, callback):
         self.text = text
         self.rect = pygame.Rect(x, y, w, h)
@@ -91,230 +622,433 @@ class Button(GameEntity):
         self.callback = callback
         self.is_hovered = False
         self.is_active = False
-        self.click_sound = pygame.mixer.Sound("assets1/sounds/click.wav")
+        self.click_sound = AudioManager().effect(CLICK_SOUND)
 
 
-    def draw(self, surface):
-        current_color = self.active_color if self.is_active else (
-            self.hover_color if self.is_hovered else self.color)
+    def draw(self, surface, current_color=None):
+        if current_color is None:
+            current_color = self.active_color if self.is_active else (
+                self.hover_color if self.is_hovered else self.color)
         pygame.draw.rect(surface, current_color, self.rect)
         pygame.draw.rect(surface, PURPLE, self.rect, 2)  # Add border
-        font = pygame.font.Font(FONT_NAME, FONT_SIZE)
-        text_surf = font.render(self.text, True, PURPLE)
+        text_surf = TextCache().render(self.text, PURPLE)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
 
-    # Inside Button class
+    def hover(self, hovered):
+        """Returns True if the button needs redrawing"""
+        changed = self.is_hovered != hovered
+        self.is_hovered = hovered
+        return changed
+
+    def press(self):
+        changed = not self.is_active
+        self.is_active = True
+        return changed
+
+    def release(self, inside, sound_enabled=True):
+        """Fires the callback if the press ends over the button, returns True if it needs redrawing"""
+        if self.is_active and inside:
+            if sound_enabled:  # Only play if sound is on
+                AudioManager().play(self.click_sound, PRIORITY_UI)
+            self.callback()
+        changed = self.is_active
+        self.is_active = False
+        return changed
+
     def handle_event(self, event, sound_enabled=True):  # Add sound_enabled parameter
+        """Handles a mouse event, returns True if the button needs redrawing"""
         if event.type == pygame.MOUSEMOTION:
-            self.is_hovered = self.rect.collidepoint(event.pos)
+            return self.hover(self.rect.collidepoint(event.pos))
         elif event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
-            self.is_active = True
+            return self.press()
         elif event.type == pygame.MOUSEBUTTONUP:
-            if self.is_active and self.rect.collidepoint(event.pos):
-                if sound_enabled:  # Only play if sound is on
-                    self.click_sound.play()
-                self.callback()
-            self.is_active = False
+            return self.release(self.rect.collidepoint(event.pos), sound_enabled)
+        return False
+
+
+# --- Hotspot ---
+class Hotspot:
+    """Invisible click area acting on press, like the back and sound icons"""
+    events = (pygame.MOUSEBUTTONDOWN,)
+
+    def __init__(self, rect, callback):
+        self.rect = pygame.Rect(rect)
+        self.callback = callback
+
+    def press(self):
+        self.callback()
+        return False  # The callback marks whatever it changes
+
+
+# --- Scene ---
+class Scene:
+    """One screen's widgets, built once and routed to through a hit-test grid"""
+
+    def __init__(self, name, widgets=(), on_key=None, title=None, back=True):
+        self.name = name
+        self.title = title  # draw_text arguments for the heading, if any
+        self.back = back  # Whether the back arrow is shown
+        self.widgets = []
+        self.buttons = []  # Drawn by the screen's draw method
+        self.grid = {}  # (column, row) -> widgets overlapping that HIT_CELL square
+        self.hovered = None
+        self.pressed = None
+        # Event type -> handler; event types no widget cares about are never looked at
+        self.routes = {}
+        if on_key is not None:
+            self.routes[pygame.KEYDOWN] = on_key
+        for widget in widgets:
+            self.add(widget)
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        if isinstance(widget, Button):
+            self.buttons.append(widget)
+        rect = widget.rect
+        for column in range(rect.left // HIT_CELL, (rect.right - 1) // HIT_CELL + 1):
+            for row in range(rect.top // HIT_CELL, (rect.bottom - 1) // HIT_CELL + 1):
+                self.grid.setdefault((column, row), []).append(widget)
+        for event_type in widget.events:
+            self.routes.setdefault(event_type, getattr(self, self.HANDLERS[event_type]))
+        return widget
+
+    def enter(self):
+        """Clears hover and press state left over from the last visit"""
+        for button in self.buttons:
+            button.is_hovered = button.is_active = False
+        self.hovered = self.pressed = None
+
+    def hit(self, pos, event_type):
+        """Topmost widget under pos listening for event_type, or None"""
+        for widget in reversed(self.grid.get((pos[0] // HIT_CELL, pos[1] // HIT_CELL), ())):
+            if event_type in widget.events and widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def dispatch(self, event, sound_enabled=True):
+        """Routes an event to the widgets it concerns, returns the rects that need redrawing"""
+        handler = self.routes.get(event.type)
+        if handler is None:
+            return ()
+        return handler(event, sound_enabled) or ()
+
+    def on_motion(self, event, sound_enabled):
+        widget = self.hit(event.pos, pygame.MOUSEMOTION)
+        if widget is self.hovered:
+            return ()
+        dirty = []
+        if self.hovered is not None and self.hovered.hover(False):
+            dirty.append(self.hovered.rect)
+        if widget is not None and widget.hover(True):
+            dirty.append(widget.rect)
+        self.hovered = widget
+        return dirty
+
+    def on_press(self, event, sound_enabled):
+        widget = self.hit(event.pos, pygame.MOUSEBUTTONDOWN)
+        if widget is None:
+            return ()
+        if pygame.MOUSEBUTTONUP in widget.events:
+            self.pressed = widget
+        return [widget.rect] if widget.press() else ()
+
+    def on_release(self, event, sound_enabled):
+        widget, self.pressed = self.pressed, None
+        if widget is None:
+            return ()
+        return [widget.rect] if widget.release(widget.rect.collidepoint(event.pos), sound_enabled) else ()
+
+    HANDLERS = {
+        pygame.MOUSEMOTION: "on_motion",
+        pygame.MOUSEBUTTONDOWN: "on_press",
+        pygame.MOUSEBUTTONUP: "on_release",
+    }
+
 
 class AnimatedGIF:
-    def __init__(self, frame_paths, position, frame_duration=300):
-        self.frames = []
-        for path in frame_paths:
-            img = pygame.image.load(path).convert_alpha()
-            # Uncomment below if you need to resize your GIF frames
-            # img = pygame.transform.scale(img, (400, 400))  # Adjust size as needed
-            self.frames.append(img)
+    def __init__(self, frame_names, position, frame_duration=300):
+        # Atlas sprites, already at the window's scale
+        self.frames = [AssetManager().sprite(name) for name in frame_names]
         self.position = position
         self.frame_duration = frame_duration
         self.current_frame = 0
         self.last_update = pygame.time.get_ticks()
         self.rect = self.frames[0].get_rect(center=(position[0], position[1]))
+        # Area actually covered by visible pixels across all frames
+        bounds = [frame.bounds for frame in self.frames]
+        self.dirty_rect = bounds[0].unionall(bounds[1:]).move(self.rect.topleft)
 
     def update(self):
+        """Advances the animation, returns True if the visible frame changed"""
         now = pygame.time.get_ticks()
         if now - self.last_update > self.frame_duration:
             self.last_update = now
             self.current_frame = (self.current_frame + 1) % len(self.frames)
+            return True
+        return False
 
     def draw(self, surface):
-        current_frame = self.frames[self.current_frame]
-        surface.blit(current_frame, self.rect)
+        self.frames[self.current_frame].draw(surface, self.rect.topleft)
 
 
 # --- Hangman Game ---
-class HangmanGame:
+class HangmanGame(HangmanEngine):
     def __init__(self, app, word_selector, selected_category=None, selected_difficulty=None):
+        super().__init__(word_selector, selected_category, selected_difficulty)
         self.app= app
-        self.word_data = self.load_words()
-        self.word_selector = word_selector
-        self.selected_category = selected_category
-        self.selected_difficulty = selected_difficulty
         self.logger = Logger()
-        self.images = [pygame.image.load(f"assets1/hangman{i}.png") for i in range(7)]
+        assets = AssetManager()
+        self.images = [assets.sprite(name) for name in HANGMAN_IMAGES]
         # Add these lines for sound effects
-        self.correct_sound = pygame.mixer.Sound("assets1/sounds/correct.wav")
-        self.correct_sound.set_volume(0.4)
-        self.wrong_sound = pygame.mixer.Sound("assets1/sounds/wrong.wav")
-        self.wrong_sound.set_volume(0.3)  # 50% volume
-        self.win_sound = pygame.mixer.Sound("assets1/sounds/win.wav")
-        self.win_sound.set_volume(0.4)
-        self.lose_sound = pygame.mixer.Sound("assets1/sounds/lose.wav")
-        self.lose_sound.set_volume(0.4)
+        audio = AudioManager()
+        self.correct_sound = audio.effect("assets1/sounds/correct.wav", 0.4)
+        self.wrong_sound = audio.effect("assets1/sounds/wrong.wav", 0.3)  # 50% volume
+        self.win_sound = audio.effect("assets1/sounds/win.wav", 0.4)
+        self.lose_sound = audio.effect("assets1/sounds/lose.wav", 0.4)
         self.reset_game()
         self.sound_enabled = True  # Add this flag
 
 
 
     def reset_game(self):
-        self.guessed_letters = []
-        self.incorrect_guesses = 0
-        # Get word/riddle from selector
-        self.category, self.word = self.word_selector.select_word(self.word_data)
-        # Set answer and hint
-        if self.category == "riddle":
-            self.answer = self.word["word"].lower()
-            self.hint = self.word["hint"]
-        else:
-            self.answer = self.word.lower()
-            self.hint = self.category
-
-        self.logger.log(f"New game: Category={self.category}, Word={self.answer}")
-
-    def load_words(self):
-        with open("words.json") as f:
-            words_data = json.load(f)
-        with open("riddles.json") as f:
-            words_data["riddle"] = json.load(f)  # Add riddles as a category
-        return words_data
+        super().reset_game()
+        self.recorded = False  # Set once the finished game is queued to the stats store
+        self.logger.log(f"New game: Category={self.category}, Word={self.answer}, "
+                        f"Difficulty={self.selected_difficulty or 'unknown'}",
+                        event="new_game", category=self.category, word=self.answer,
+                        difficulty=self.selected_difficulty)
 
     def guess(self, letter):
-        if letter not in self.guessed_letters:
-            self.guessed_letters.append(letter)
-            if letter not in self.answer:
-                self.incorrect_guesses += 1
-                self.app.play_sound(self.wrong_sound)
-                self.logger.log(f"Wrong guess: {letter}")
-            else:
-                self.app.play_sound(self.correct_sound)
-                self.logger.log(f"Correct guess: {letter}")
-
-    def get_display_word(self):
-        return ' '.join([l if l in self.guessed_letters else '_' for l in self.answer])
-
-    def has_won(self):
-        return '_' not in self.get_display_word()
-
-    def has_lost(self):
-        return self.incorrect_guesses >= MAX_TRIES
+        correct = super().guess(letter)
+        if correct is False:
+            self.app.play_sound(self.wrong_sound)
+            self.logger.log(f"Wrong guess: {letter}", event="guess", letter=letter, correct=False)
+        elif correct:
+            self.app.play_sound(self.correct_sound)
+            self.logger.log(f"Correct guess: {letter}", event="guess", letter=letter, correct=True)
+        if correct is not None and not self.recorded and (self.has_won() or self.has_lost()):
+            self.recorded = True
+            state = self.state
+            self.app.stats.record_game(self.category, self.selected_difficulty, self.answer, self.has_won(),
+                                       state.wrong, [(guessed, guessed in state.correct_letters)
+                                                     for guessed in state.guessed])
+        return correct
 
     def draw_hangman(self, surface):
         image = self.images[self.incorrect_guesses]
-        x = WIDTH // 2 - image.get_width() // 2
+        x = WIDTH // 2 - image.size[0] // 2
         y = -100
-        surface.blit(image, (x, y))
+        image.draw(surface, (x, y))
 
 
 # --- App Interface ---
 class HangmanApp:
-    def __init__(self):
+    def __init__(self, seed=None):
+        self.timeline = StartupTimeline()
+        self.timeline.span("import", IMPORT_STARTED, IMPORT_FINISHED)
+        start = time.perf_counter()
+        pygame.mixer.pre_init(MIXER_FREQUENCY, -16, MIXER_CHANNELS)
         pygame.init()
+        self.timeline.span("pygame.init", start)
+        start = time.perf_counter()
         pygame.mixer.init()
-        self.menu_title_font = pygame.font.Font(FONT_NAME, MENU_TITLE_FONT_SIZE)
-        #background sound
-        self.background_music = pygame.mixer.Sound("assets1/sounds/background.wav")
-        self.background_music.play(loops=-1)  # -1 = infinite loop
-        self.background_music.set_volume(1)  # 30% volume
+        self.audio = AudioManager()
+        self.audio.init()
+        self.timeline.span("mixer init", start)
+        self.first_frame_shown = False
+        self.profiler = FrameProfiler(os.environ.get(PROFILE_ENV) == "1")
+        # Every word choice derives from the session seed, so a recording replays the same games
+        self.seed = session_seed() if seed is None else seed
+        self.games_started = 0
+        self.recorder = None
+        if os.environ.get(RECORD_ENV):
+            self.recorder = ReplayWriter(os.environ[RECORD_ENV], self.seed)
+            atexit.register(self.recorder.close)
+        self.stats = StatsStore(STATS_FILE)  # Finished games are written on its own thread
+        atexit.register(self.stats.close)
+        self.stats_summary = None
 
         self.selected_category = None
         self.selected_difficulty = None
         self.game = None  # We'll initialize this later
 
+        start = time.perf_counter()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("OOP Hangman Game")
-        self.font = pygame.font.Font(FONT_NAME, FONT_SIZE)
-        self.title_font = pygame.font.Font(FONT_NAME, TITLE_FONT_SIZE)
+        self.timeline.span("set_mode", start)
+        self.assets = AssetManager()
+        self.assets.timeline = self.timeline
+        start = time.perf_counter()
+        self.menu_title_font = FontRegistry().get(FONT_NAME, MENU_TITLE_FONT_SIZE)
+        self.font = FontRegistry().get(FONT_NAME, FONT_SIZE)
+        self.title_font = FontRegistry().get(FONT_NAME, TITLE_FONT_SIZE)
+        self.timeline.span("fonts", start)
+        self.assets.preload(MENU_MANIFEST)  # Just enough for the menu, the rest loads in the background
+        self.text_cache = TextCache()
         self.clock = pygame.time.Clock()
-        self.buttons = []
+        self.compositor = Compositor((WIDTH, HEIGHT))
         self.running = True
         self.game_over = False
-        self.current_screen = "menu"  # Can be "menu", "categories", "difficulty", or "game"
-        self.initialize_buttons()
+        # Dirty-rectangle rendering state
+        self.dirty_rendering = DIRTY_RENDERING
+        self.full_redraw = True
+        self.dirty_rects = []
+        self.hangman_area = None
+        self.current_screen = "menu"  # Can be "menu", "categories", "difficulty", "game" or "stats"
         # Add this with other initialization code
         self.win_animation = None
-        self.win_frames = [f"assets1/win_{i}.png" for i in range(2)]  # Adjust based on your frames
+        self.strategies = {}  # (category, difficulty) -> strategy, so shuffle bags survive menu trips
+        self.solvers = {}  # (category, difficulty) -> LetterSolver for the hint button, None while it is built
+        self.hint_pending = False  # Hint clicked before its solver was ready
+        self.difficulty_table = None  # Calibrated buckets from calibrate.py, loaded in the background
+        self.hint_letter = None
+        self.win_frames = WIN_FRAMES  # Adjust based on your frames
 
         # ====== BUTTON POSITIONS UPDATE ======
-        # Back button (top-left) - will be just an arrow icon
-        self.back_arrow_img = pygame.image.load("assets1/back_arrow.jpg").convert_alpha()
-        self.back_arrow_img = pygame.transform.scale(self.back_arrow_img, (30, 30))
+        # Back button (top-left) - will be just an arrow icon, loaded in the background
         self.back_button_rect = pygame.Rect(10, 10, 30, 30)  # Positioned at top-left (10px from edges)
 
         # Sound button (top-right) - moved from left to right
         self.sound_on = True
-        self.sound_on_img = pygame.image.load(SOUND_ON_ICON).convert_alpha()
-        self.sound_off_img = pygame.image.load(SOUND_OFF_ICON).convert_alpha()
         self.sound_button_rect = pygame.Rect(WIDTH - 40, 10, 30, 30)  # Top-right (10px from right edge)
 
-
-        # Scale down your 370x260 images to 30x30
-        self.sound_on_img = pygame.transform.scale(self.sound_on_img, (30, 30))
-        self.sound_off_img = pygame.transform.scale(self.sound_off_img, (30, 30))
-
-    def play_sound(self, sound):
+        # Scaled down from the 370x260 images to 30x30 by the atlas build step
+        self.sound_on_img = self.assets.sprite(SOUND_ON_ICON)
+        self.sound_off_img = self.assets.sprite(SOUND_OFF_ICON)
+        # Global key bindings and event routes, checked before the current scene's
+        self.function_keys = {
+            pygame.K_F2: self.timeline.dump,  # Startup timeline on request
+            pygame.K_F3: self.toggle_profiler,
+            pygame.K_F4: self.export_profile,
+        }
+        self.routes = {pygame.QUIT: self.quit, pygame.KEYDOWN: self.on_function_key, HINT_READY: self.on_hint_ready}
+        self.scenes = self.build_scenes()
+        self.switch_scene()
+        self.loader = AssetLoader(ASSET_MANIFEST, self.finish_loading).start()
+
+    def finish_loading(self):
+        """Runs on the loader thread once every asset is decoded"""
+        start = time.perf_counter()
+        word_data = HangmanGame.load_words()
+        self.difficulty_table = load_difficulty_table()
+        if self.difficulty_table is not None and isinstance(word_data, CorpusIndex):
+            self.difficulty_table.group_entries(word_data)  # Calibrated buckets for the shuffle bags
+        self.timeline.span("word corpus", start)
+        self.audio.play_music(BACKGROUND_MUSIC, loops=-1)  # -1 = infinite loop, streamed from disk
+        self.timeline.mark("assets ready")
+        if os.environ.get(TIMELINE_ENV):
+            self.timeline.dump(os.environ[TIMELINE_ENV])
+
+    def assets_ready(self):
+        return self.loader.is_ready()
+
+    def play_sound(self, sound, priority=PRIORITY_FEEDBACK):
         """Plays a sound only if sound is enabled"""
         if self.sound_on and sound is not None:
-            sound.play()
+            self.audio.play(sound, priority)
 
     def toggle_sound(self):
         self.sound_on = not self.sound_on
-        # Set volume for all components
-        volume = 1.0 if self.sound_on else 0.0
-        self.background_music.set_volume(volume)
-        # Update button sounds
-        for button in self.buttons:
-            if hasattr(button, 'click_sound'):
-                button.click_sound.set_volume(volume)
-
-
-
-    def initialize_buttons(self):
-        self.buttons = []
-
-        if self.current_screen == "menu":
-            self.buttons.append(Button("Start Game", WIDTH // 2 - 150, HEIGHT // 2, 300, 60, self.show_categories))
-        elif self.current_screen == "categories":
-            self.buttons.append(Button("Riddles", WIDTH // 2 - 150, HEIGHT // 2 - 50, 300, 60,
-                                       lambda: self.select_category("riddle")))
-            self.buttons.append(Button("Words", WIDTH // 2 - 150, HEIGHT // 2 + 50, 300, 60,
-                                       lambda: self.select_category("words")))
-        elif self.current_screen == "difficulty":
-            self.buttons.append(Button("Easy", WIDTH // 2 - 150, HEIGHT // 2 - 100, 300, 60,
-                                       lambda: self.select_difficulty("easy")))
-            self.buttons.append(Button("Medium", WIDTH // 2 - 150, HEIGHT // 2, 300, 60,
-                                       lambda: self.select_difficulty("medium")))
-            self.buttons.append(Button("Hard", WIDTH // 2 - 150, HEIGHT // 2 + 100, 300, 60,
-                                       lambda: self.select_difficulty("hard")))
-        elif self.current_screen == "game":
-            self.buttons.append(Button("Restart", 650, 500, 110, 60, self.restart_game))
+        # Mute or unmute music and effects
+        self.audio.set_enabled(self.sound_on)
+        self.compositor.invalidate()  # Every screen's static layer shows the sound icon
+        self.mark_dirty(self.sound_button_rect)
+
+    def mark_dirty(self, rect):
+        """Schedules a screen region to be redrawn and pushed on the next frame"""
+        self.dirty_rects.append(pygame.Rect(rect).clip(self.screen.get_rect()))
+
+    def request_full_redraw(self):
+        self.full_redraw = True
+
+    def mark_game_dirty(self):
+        """Marks every game screen region a guess can change"""
+        if self.game.has_won() or self.game.has_lost():
+            self.request_full_redraw()  # The win animation covers most of the window
+            return
+        if self.hangman_area is None:
+            bounds = [image.bounds for image in self.game.images]
+            self.hangman_area = bounds[0].unionall(bounds[1:]).move(HANGMAN_POS)
+        self.mark_dirty(self.hangman_area)
+        self.mark_dirty(GAME_STATUS_RECT)
+
+    def is_animating(self):
+        return (self.current_screen == "game" and self.win_animation is not None
+                and self.game.has_won())
+
+
+    def build_scenes(self):
+        """Creates every screen's widgets once; screen changes only swap the current scene"""
+        back = Hotspot(self.back_button_rect, self.go_back)
+        sound = Hotspot(self.sound_button_rect, self.toggle_sound)
+        x = WIDTH // 2 - 150
+        game = [Button("Restart", 650, 500, 110, 60, self.restart_game)]
+        if LetterSolver is not None:
+            game.append(Button("Hint", 530, 500, 110, 60, self.show_hint))
+        return {
+            "menu": Scene("menu", [
+                Button("Start Game", x, HEIGHT // 2, 300, 60, self.show_categories),
+                Button("Stats", x, HEIGHT // 2 + 80, 300, 60, self.show_stats), sound],
+                title=("Hangman Game", (WIDTH // 2 - 250, HEIGHT // 4), PURPLE, MENU_TITLE_FONT_SIZE),
+                back=False),
+            "categories": Scene("categories", [
+                Button("Riddles", x, HEIGHT // 2 - 50, 300, 60, lambda: self.select_category("riddle")),
+                Button("Words", x, HEIGHT // 2 + 50, 300, 60, lambda: self.select_category("words")),
+                back, sound],
+                title=("Categories", (WIDTH // 2 - 100, HEIGHT // 4), PURPLE, TITLE_FONT_SIZE)),
+            "difficulty": Scene("difficulty", [
+                Button("Easy", x, HEIGHT // 2 - 100, 300, 60, lambda: self.select_difficulty("easy")),
+                Button("Medium", x, HEIGHT // 2, 300, 60, lambda: self.select_difficulty("medium")),
+                Button("Hard", x, HEIGHT // 2 + 100, 300, 60, lambda: self.select_difficulty("hard")),
+                back, sound],
+                title=("Difficulty Level", (WIDTH // 2 - 125, HEIGHT // 6), PURPLE, TITLE_FONT_SIZE)),
+            "game": Scene("game", game + [back, sound], on_key=self.on_game_key),
+            "stats": Scene("stats", [back, sound],
+                           title=("Statistics", (WIDTH // 2 - 90, 30), PURPLE, TITLE_FONT_SIZE)),
+        }
+
+    def switch_scene(self):
+        """Makes the scene for current_screen the one receiving events and drawing"""
+        self.scene = self.scenes[self.current_screen]
+        self.scene.enter()
+        self.buttons = self.scene.buttons
+        self.request_full_redraw()  # Every screen change repaints the whole window
 
     def show_categories(self):
         self.current_screen = "categories"
-        self.initialize_buttons()
+        self.switch_scene()
+
+    def show_stats(self):
+        self.stats.flush()  # Include the game that just ended
+        self.stats_summary = self.stats.summary(top=8)
+        self.current_screen = "stats"
+        self.switch_scene()
 
     def select_category(self, category):
         self.selected_category = category
         self.current_screen = "difficulty"
-        self.initialize_buttons()
+        self.switch_scene()
 
     def select_difficulty(self, difficulty):
+        self.loader.wait()  # The game screen needs the deferred assets and the word corpus
         self.selected_difficulty = difficulty
+        self.hint_letter = None
+        self.hint_pending = False
         self.current_screen = "game"
-        self.initialize_buttons()
+        self.switch_scene()
 
         # Create the strategy FIRST
-        strategy = RandomCategoryStrategy(self.selected_category, self.selected_difficulty)
+        key = (self.selected_category, self.selected_difficulty)
+        strategy = self.strategies.get(key)
+        if strategy is None:
+            rng = random.Random(f"{self.seed}/{key[0]}/{key[1]}")
+            if isinstance(HangmanGame.load_words(), CorpusIndex):
+                strategy = ShuffleBagStrategy(*key, rng=rng, table=self.difficulty_table)
+            else:
+                strategy = RandomCategoryStrategy(*key, rng=rng, table=self.difficulty_table)
+            self.strategies[key] = strategy
 
         # Pass parameters in CORRECT ORDER:
         self.game = HangmanGame(
@@ -323,33 +1057,73 @@ class HangmanApp:
             self.selected_category,
             self.selected_difficulty
         )
+        self.games_started += 1
         self.game_over = False
+        self.prepare_hint()
+
+    def prepare_hint(self):
+        """Starts indexing the current word's category for the Hint button on a background thread"""
+        key = (self.game.category, self.selected_difficulty)  # The category the player sees as the hint
+        if LetterSolver is None or key in self.solvers:
+            return
+        self.solvers[key] = None
+        threading.Thread(target=self._build_solver, args=(key, self.game.word_data), name="LetterSolver",
+                         daemon=True).start()
+
+    def _build_solver(self, key, word_data):
+        self.solvers[key] = LetterSolver(select_answers(word_data, *key, table=self.difficulty_table))
+        try:
+            pygame.event.post(pygame.event.Event(HINT_READY, key=key))
+        except pygame.error:
+            pass  # The window closed meanwhile
+
+    def show_hint(self):
+        """Suggests the letter found in the most words still matching the board"""
+        if self.game_over:
+            return
+        self.prepare_hint()
+        solver = self.solvers[(self.game.category, self.selected_difficulty)]
+        if solver is None:
+            self.hint_pending = True  # on_hint_ready shows it once the solver is built
+            return
+        self.hint_pending = False
+        self.hint_letter = solver.suggest_for(self.game.state)
+        self.mark_dirty(GAME_STATUS_RECT)
+
+    def on_hint_ready(self, event):
+        """A solver finished building; answers a Hint click that was waiting for it"""
+        key = (self.game.category, self.selected_difficulty) if self.game else None
+        if self.hint_pending and event.key == key:
+            self.show_hint()
 
     def restart_game(self):
+        self.hint_letter = None
+        self.hint_pending = False
         self.game.reset_game()
+        self.games_started += 1
         self.game.sound_enabled = self.sound_on  # Maintain sound state
         self.game_over = False
         if hasattr(self, 'win_animation'):
             self.win_animation = None
+        self.request_full_redraw()
+        self.prepare_hint()
 
-    def draw_text(self, text, pos, color=BLUE, font=None):
-        if font is None:
-            font = self.font
-        surface = font.render(text, True, color)
-        self.screen.blit(surface, pos)
+    def draw_text(self, text, pos, color=BLUE, size=FONT_SIZE, target=None):
+        surface = self.text_cache.render(text, color, size)
+        (target or self.screen).blit(surface, pos)
 
     def go_back(self):
         if self.current_screen == "game":
             self.current_screen = "difficulty"
         elif self.current_screen == "difficulty":
             self.current_screen = "categories"
-        elif self.current_screen == "categories":
+        elif self.current_screen in ("categories", "stats"):
             self.current_screen = "menu"
-        self.initialize_buttons()
+        self.switch_scene()
 
     def draw_back_button(self, surface):
-        if self.current_screen != "menu":  # No back button on main menu
-            surface.blit(self.back_arrow_img, self.back_button_rect)
+        if self.scene.back:  # No back button on main menu
+            self.assets.sprite(BACK_ARROW_ICON).draw(surface, self.back_button_rect.topleft)
 
 
     def draw_sound_button(self, surface):
@@ -357,104 +1131,201 @@ class HangmanApp:
         # Optional: Add white background
         pygame.draw.rect(surface, WHITE, self.sound_button_rect)
         # Draw icon
-        surface.blit(current_icon, self.sound_button_rect)
+        current_icon.draw(surface, self.sound_button_rect.topleft)
         # Add purple border
         pygame.draw.rect(surface, PURPLE, self.sound_button_rect, 2)
 
-    def draw_menu(self):
-        self.draw_text("Hangman Game", (WIDTH // 2 - 250, HEIGHT // 4), PURPLE, self.menu_title_font)
-        for button in self.buttons:
-            button.draw(self.screen)
-        self.draw_sound_button(self.screen)
-
-
-    def draw_categories(self):
-        self.draw_text("Categories", (WIDTH // 2 - 100, HEIGHT // 4), PURPLE, self.title_font)
+    def draw_static_layer(self, surface):
+        """Paints what only changes with the screen or the sound setting: fill, title, idle buttons, icons"""
+        surface.fill(LILAC)
+        if self.scene.title:
+            self.draw_text(*self.scene.title, target=surface)
         for button in self.buttons:
-            button.draw(self.screen)
-        self.draw_sound_button(self.screen)
-        self.draw_back_button(self.screen)
+            button.draw(surface, button.color)
+        self.draw_sound_button(surface)
+        self.draw_back_button(surface)
 
-    def draw_difficulty(self):
-        self.draw_text("Difficulty Level", (WIDTH // 2 - 125, HEIGHT // 6), PURPLE, self.title_font)
+    def draw_buttons(self):
+        """Only hovered or pressed buttons differ from the static layer"""
         for button in self.buttons:
-            button.draw(self.screen)
-        self.draw_sound_button(self.screen)
-        self.draw_back_button(self.screen)
+            if button.is_hovered or button.is_active:
+                button.draw(self.screen)
 
     def draw_game(self):
             # Only draw hangman progression if game isn't won yet
         if not self.game.has_won():
             hangman_img = self.game.images[self.game.incorrect_guesses]
-            hangman_x = -5
-            hangman_y = -100  # 50 pixels from top
-            self.screen.blit(hangman_img, (hangman_x, hangman_y))
-        self.draw_sound_button(self.screen)
-        self.draw_back_button(self.screen)
+            hangman_img.draw(self.screen, HANGMAN_POS)
 
         # Win animation (if won)
         if self.game.has_won():
             if self.win_animation is None:
-                    self.play_sound(self.game.win_sound)
+                    self.play_sound(self.game.win_sound, PRIORITY_RESULT)
                     # Center the animation with these coordinates
                     win_x = WIDTH // 2 - 8  # Adjust based on your GIF size
                     win_y = 200  # Below hangman area
                     self.win_animation = AnimatedGIF(self.win_frames, (win_x, win_y))
-            self.win_animation.update()
             self.win_animation.draw(self.screen)
             self.draw_text("You Won!", (WIDTH // 2 - 52, 350), GREEN)  # Position below GIF
             self.game_over = True
         elif self.game.has_lost():
             if not self.game_over:  # Only play sound once
-                self.play_sound(self.game.lose_sound)
+                self.play_sound(self.game.lose_sound, PRIORITY_RESULT)
                 self.game_over = True
             self.draw_text(f"You Lost! Word: {self.game.answer}", (WIDTH // 2 - 145, 350), RED)
 
         # Bottom-left texts
         self.draw_text(f"Hint: {self.game.hint}", (50, 400), BLUE)
         self.draw_text(f"Word: {self.game.get_display_word()}", (50, 440), BLACK)
-        correct_letters = ' '.join([l for l in self.game.guessed_letters if l in self.game.answer])
-        incorrect_letters = ' '.join([l for l in self.game.guessed_letters if l not in self.game.answer])
+        correct_letters = ' '.join(self.game.state.correct_letters)
+        incorrect_letters = ' '.join(self.game.state.wrong_letters)
         self.draw_text(f"Correct guesses: {correct_letters}", (50, 480), GREEN)
         self.draw_text(f"Incorrect guesses: {incorrect_letters}", (50, 520), RED)
-
-        for button in self.buttons:
-            button.draw(self.screen)
+        if self.hint_letter and not self.game_over:
+            self.draw_text(f"Try: {self.hint_letter.upper()}", (650, 460), PURPLE)
+
+    def draw_stats(self):
+        """Win rates per category and difficulty on the left, the hardest words on the right"""
+        summary = self.stats_summary
+        totals = summary["totals"]
+        rate = totals["wins"] / totals["games"] if totals["games"] else 0.0
+        self.draw_text(f"Games: {totals['games']}   Won: {rate:.0%}", (50, 100), BLACK)
+        self.draw_text("Category / difficulty", (50, 150), PURPLE)
+        for i, group in enumerate(summary["groups"][:9]):
+            self.draw_text(f"{group['category']} / {group['difficulty']}: {group['wins'] / group['games']:.0%} "
+                           f"of {group['games']}", (50, 190 + i * 40), BLUE)
+        self.draw_text("Hardest words", (480, 150), PURPLE)
+        for i, word in enumerate(summary["hardest"]):
+            self.draw_text(f"{word['word']}: {word['avg_wrong']:.1f} wrong", (480, 190 + i * 40), RED)
+
+    def wait_for_events(self):
+        """Returns pending events, sleeping until input arrives when nothing needs drawing"""
+        if self.full_redraw or self.dirty_rects or self.is_animating():
+            return pygame.event.get()
+        self.profiler.phase("idle")
+        event = pygame.event.wait(IDLE_WAIT_MS)
+        self.profiler.phase("events")
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def draw_screen(self):
+        # Static layer from the cache, then the dynamic layers on top; clipping applies to the blit too
+        self.screen.blit(self.compositor.layer(self.current_screen, self.draw_static_layer), (0, 0))
+        if self.current_screen == "game":
+            self.draw_game()
+        elif self.current_screen == "stats":
+            self.draw_stats()
+        self.draw_buttons()
+        self.profiler.draw_overlay(self.screen)
+
+    def render(self):
+        """Redraws what changed since the last frame, returns True if anything was drawn"""
+        if self.full_redraw or self.dirty_rects:
+            self.profiler.phase(f"draw_{self.current_screen}")
+        if self.full_redraw:
+            self.draw_screen()
+            self.profiler.phase("flip")
+            pygame.display.flip()
+            if not self.first_frame_shown:
+                self.first_frame_shown = True
+                self.timeline.mark("first flip")
+        elif self.dirty_rects:
+            # Clip drawing to the changed area and only copy those rects to the display
+            self.screen.set_clip(self.dirty_rects[0].unionall(self.dirty_rects[1:]))
+            self.draw_screen()
+            self.screen.set_clip(None)
+            self.profiler.phase("flip")
+            pygame.display.update(self.dirty_rects)
+        else:
+            return False
+        self.full_redraw = False
+        self.dirty_rects = []
+        return True
+
+    def quit(self, event):
+        self.running = False
+
+    def on_function_key(self, event):
+        action = self.function_keys.get(event.key)
+        if action is not None:
+            action()
+
+    def on_game_key(self, event, sound_enabled):
+        """KEYDOWN route of the game scene: letters are guesses"""
+        if not self.game_over and event.unicode.isalpha():
+            self.game.guess(event.unicode.lower())
+            self.hint_letter = None
+            self.hint_pending = False
+            self.mark_game_dirty()
+
+    def toggle_profiler(self):
+        self.profiler.toggle()
+        self.request_full_redraw()  # Show or clear the overlay
+
+    def export_profile(self):
+        path = os.environ.get(PROFILE_TRACE_ENV) or "frame_trace.json"
+        self.profiler.export(path)
+        Logger().log(f"Frame trace written to {path}", event="profile", path=path)
+
+    def replay_state(self):
+        """What a replay checks after every frame"""
+        game = self.game
+        if game is None:
+            return (self.current_screen, self.selected_category or "", self.selected_difficulty or "",
+                    "", "", 0, self.sound_on)
+        return (self.current_screen, self.selected_category or "", self.selected_difficulty or "",
+                game.answer, game.state.guessed, game.incorrect_guesses, self.sound_on)
+
+    def step(self, events):
+        """Dispatches one frame's events, advances the animation and renders; returns True if drawn"""
+        start = time.perf_counter()
+        self.profiler.phase("dispatch")
+        for event in events:
+            if self.recorder and event.type in RECORDED_EVENTS:
+                self.recorder.event(event)
+            handler = self.routes.get(event.type)
+            if handler is not None:
+                handler(event)
+            for rect in self.scene.dispatch(event, self.sound_on):
+                self.mark_dirty(rect)
+
+        if self.is_animating() and self.win_animation.update():
+            self.mark_dirty(self.win_animation.dirty_rect)
+
+        rendered = self.render()
+        if self.recorder:
+            word = (self.game.category, self.game.hint) if self.game else ("", "")
+            self.recorder.end_frame(self.replay_state(), self.games_started, word, rendered,
+                                    time.perf_counter() - start, bool(events))
+        return rendered
 
     def run(self):
+        profiler = self.profiler
         while self.running:
-            self.screen.fill(LILAC)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # Back button (top-left)
-                    if self.back_button_rect.collidepoint(event.pos) and self.current_screen != "menu":
-                        self.go_back()
-                    # Sound button (top-right)
-                    elif self.sound_button_rect.collidepoint(event.pos):
-                        self.toggle_sound()
-
-                if self.current_screen == "game" and not self.game_over:
-                    if event.type == pygame.KEYDOWN and event.unicode.isalpha():
-                        self.game.guess(event.unicode.lower())
-
-                for button in self.buttons:
-                    button.handle_event(event, self.sound_on)
-
-            if self.current_screen == "menu":
-                self.draw_menu()
-            elif self.current_screen == "categories":
-                self.draw_categories()
-            elif self.current_screen == "difficulty":
-                self.draw_difficulty()
-            elif self.current_screen == "game":
-                self.draw_game()
+            if not self.dirty_rendering:
+                self.request_full_redraw()
+            if profiler.overlay_due():
+                self.mark_dirty(OVERLAY_RECT)
+            profiler.begin_frame("events")
+            events = self.wait_for_events()
+            rendered = self.step(events)
+            # Cap the frame rate while something is drawn, and between animation frames so they don't spin
+            if rendered or self.is_animating():
+                profiler.phase("tick")
+                self.clock.tick(FPS)
+            profiler.end_frame(rendered)
+
+        if profiler.enabled and os.environ.get(PROFILE_TRACE_ENV):
+            self.export_profile()
+        if self.recorder:
+            self.recorder.close()
+        self.stats.close()  # Commit the games still queued
+        Logger().close()  # Flush pending log records before exiting
+        pygame.quit()
 
-            pygame.display.flip()
-            self.clock.tick(30)
 
-        pygame.quit()
+IMPORT_FINISHED = time.perf_counter()
 
 
 # --- Run App ---
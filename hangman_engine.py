@@ -0,0 +1,303 @@
+# hangman_engine.py
+# Pygame-free game rules shared by the window, the simulator and other tools
+import json
+import random
+from abc import ABC, abstractmethod
+from array import array
+from word_corpus import (CORPUS_INDEX, DIFFICULTIES, RIDDLES_FILE, WORDS_FILE, CorpusIndex, ShuffleBag,
+                         build_index, is_stale, load_sources)
+
+MAX_TRIES = 6
+DIFFICULTY_TABLE = "difficulty_table.json"  # Written by calibrate.py
+TABLE_VERSION = 1  # Layout of the difficulty table; tables from other versions are ignored
+
+
+# --- Strategy Pattern ---
+class WordStrategy(ABC):
+    @abstractmethod
+    def select_word(self, word_data):
+        pass
+
+
+class RandomCategoryStrategy(WordStrategy):
+    def __init__(self, selected_category=None, selected_difficulty=None, rng=None, table=None):
+        self.selected_category = selected_category
+        self.selected_difficulty = selected_difficulty
+        self.rng = rng or random.Random()  # Pass a seeded Random to make the word sequence reproducible
+        self.table = table  # Optional DifficultyTable that replaces the hand-assigned buckets
+
+    def select_word(self, word_data):
+        if self.table is not None:
+            word_data = self.table.regroup(word_data)
+        if self.selected_category == "riddle":
+            difficulty = self.selected_difficulty or self.rng.choice(["easy", "medium", "hard"])
+            riddle, answer = self.rng.choice(word_data["riddle"][difficulty])
+            return "riddle", {"word": answer, "hint": riddle}
+        else:
+            # For "words" option, pick random category (animal/color/country/fruit)
+            word_categories = [cat for cat in word_data.keys() if cat != "riddle"]
+            category = self.rng.choice(word_categories)
+            difficulty = self.selected_difficulty or self.rng.choice(["easy", "medium", "hard"])
+            word = self.rng.choice(word_data[category][difficulty])
+            return category, word.lower()  # category becomes the hint
+
+
+class ShuffleBagStrategy(WordStrategy):
+    """Serves every matching word once before repeating any; needs a compiled CorpusIndex"""
+
+    def __init__(self, selected_category=None, selected_difficulty=None, rng=None, table=None):
+        self.selected_category = selected_category
+        self.selected_difficulty = selected_difficulty
+        self.rng = rng or random.Random()
+        self.table = table  # Optional DifficultyTable; the bag then holds the calibrated bucket
+        self.bag = None
+
+    def select_word(self, word_data):
+        if self.bag is None:
+            if self.selected_category == "riddle":
+                categories = ["riddle"]
+            else:
+                categories = [cat for cat in word_data.keys() if cat != "riddle"]
+            if self.table is not None:
+                ranges = self.table.ranges(word_data, categories, self.selected_difficulty)
+            else:
+                ranges = word_data.ranges(categories, self.selected_difficulty)
+            self.bag = ShuffleBag(ranges, self.rng)
+        category, answer, hint = word_data.entry(self.bag.draw())
+        if category == "riddle":
+            return "riddle", {"word": answer, "hint": hint}
+        return category, answer  # category becomes the hint
+
+
+def select_answers(word_data, category=None, difficulty=None, table=None):
+    """Every answer a strategy could pick for this category ("words", one category or None) and difficulty,
+    from the calibrated buckets when a DifficultyTable is given"""
+    if category == "words":
+        categories = [cat for cat in word_data.keys() if cat != "riddle"]
+    elif category is None:
+        categories = list(word_data.keys())
+    else:
+        categories = [category]
+    if table is not None:
+        if isinstance(word_data, CorpusIndex):
+            return [word_data.entry(entry_id)[1] for first, count in table.ranges(word_data, categories, difficulty)
+                    for entry_id in range(first, first + count)]
+        word_data = table.regroup(word_data)
+    answers = []
+    for cat in categories:
+        for diff, entries in word_data[cat].items():
+            if difficulty is None or diff == difficulty:
+                answers.extend((entry[1] if cat == "riddle" else entry).lower() for entry in entries)
+    return answers
+
+
+# --- Calibrated Difficulty ---
+class DifficultyTable:
+    """Difficulty of every (category, answer) as measured by calibrate.py"""
+
+    def __init__(self, levels):
+        self.levels = levels  # category -> {answer: difficulty}
+        self.source = None
+        self.grouped = None
+        self.index = None
+        self.entry_groups = None
+
+    @classmethod
+    def load(cls, path=DIFFICULTY_TABLE):
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != TABLE_VERSION:
+            raise ValueError(f"{path} is not a version {TABLE_VERSION} difficulty table")
+        try:
+            return cls({category: {answer: entry[-1] for answer, entry in info["entries"].items()}
+                        for category, info in data["categories"].items()})
+        except (LookupError, TypeError, AttributeError) as error:
+            raise ValueError(f"{path} is not a valid difficulty table") from error
+
+    def regroup(self, word_data):
+        """word_data re-bucketed by calibrated difficulty, shaped like HangmanEngine.load_words;
+        answers the table does not know keep their hand-assigned bucket"""
+        if self.source is not word_data:
+            grouped = {}
+            for category in word_data.keys():
+                levels = self.levels.get(category, {})
+                buckets = grouped[category] = {difficulty: [] for difficulty in DIFFICULTIES}
+                for difficulty, entries in word_data[category].items():
+                    for entry in entries:
+                        answer = (entry[1] if category == "riddle" else entry).lower()
+                        buckets.setdefault(levels.get(answer, difficulty), []).append(entry)
+            self.source, self.grouped = word_data, grouped
+        return self.grouped
+
+
+    def group_entries(self, index):
+        """{(category, calibrated difficulty): entry ids} for a CorpusIndex, computed once per index"""
+        if self.index is not index:
+            groups = {}
+            for category, buckets in index.groups.items():
+                levels = self.levels.get(category, {})
+                for difficulty, (first, count) in buckets.items():
+                    for entry_id in range(first, first + count):
+                        level = levels.get(index.entry(entry_id)[1], difficulty)
+                        groups.setdefault((category, level), array("I")).append(entry_id)
+            self.index, self.entry_groups = index, groups
+        return self.entry_groups
+
+    def ranges(self, index, categories, difficulty=None):
+        """Like CorpusIndex.ranges, but (first entry, count) runs over the calibrated buckets"""
+        if difficulty is None:
+            return index.ranges(categories)
+        groups = self.group_entries(index)
+        runs = []
+        for category in categories:
+            for entry_id in groups.get((category, difficulty), ()):
+                if runs and runs[-1][0] + runs[-1][1] == entry_id:
+                    runs[-1][1] += 1
+                else:
+                    runs.append([entry_id, 1])
+        return [tuple(run) for run in runs]
+
+
+def load_difficulty_table(path=DIFFICULTY_TABLE):
+    """The calibrated table if calibrate.py has written a usable one, otherwise None (play stays unweighted)"""
+    try:
+        return DifficultyTable.load(path)
+    except (OSError, ValueError):  # Missing, truncated or from another version
+        return None
+
+
+# --- Game State ---
+class GameState:
+    """Compact guess state for one answer; guess, has_won and display lookups are O(1)"""
+    __slots__ = ("answer", "positions", "guessed_mask", "reveal_mask", "remaining", "wrong",
+                 "guessed", "correct_letters", "wrong_letters", "chars", "display")
+
+    def __init__(self, answer):
+        self.answer = answer
+        # Bitmask of answer positions for each letter a-z
+        self.positions = [0] * 26
+        for i, char in enumerate(answer):
+            if "a" <= char <= "z":
+                self.positions[ord(char) - 97] |= 1 << i
+        self.guessed_mask = 0
+        # Anything that is not a letter (spaces in "beluga whale") starts revealed
+        self.reveal_mask = sum(1 << i for i, char in enumerate(answer) if not "a" <= char <= "z")
+        self.remaining = sum(1 for mask in self.positions if mask)
+        self.wrong = 0
+        self.guessed = ""
+        self.correct_letters = ""
+        self.wrong_letters = ""
+        self.chars = [char if self.reveal_mask >> i & 1 else "_" for i, char in enumerate(answer)]
+        self.display = " ".join(self.chars)
+
+    def guess(self, letter):
+        """Returns True for a correct guess, False for a wrong one, None if repeated, not a-z or the game is over"""
+        if len(letter) != 1 or not "a" <= letter <= "z":
+            return None
+        if self.remaining == 0 or self.wrong >= MAX_TRIES:
+            return None  # Keys pressed after the last guess would push wrong past the gallows images
+        bit = 1 << (ord(letter) - 97)
+        if self.guessed_mask & bit:
+            return None
+        self.guessed_mask |= bit
+        self.guessed += letter
+        positions = self.positions[ord(letter) - 97]
+        if not positions:
+            self.wrong += 1
+            self.wrong_letters += letter
+            return False
+        self.reveal_mask |= positions
+        self.remaining -= 1
+        self.correct_letters += letter
+        for i, char in enumerate(self.answer):
+            if positions >> i & 1:
+                self.chars[i] = char
+        self.display = " ".join(self.chars)
+        return True
+
+    def has_won(self):
+        return self.remaining == 0
+
+    def has_lost(self):
+        return self.wrong >= MAX_TRIES
+
+    def snapshot(self):
+        """Everything needed to rebuild this state: the answer and the guessed letters"""
+        return self.answer, self.guessed
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        answer, guessed = snapshot
+        state = cls(answer)
+        for letter in guessed:
+            state.guess(letter)
+        return state
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and (self.answer, self.guessed_mask) == (other.answer, other.guessed_mask)
+
+    def __hash__(self):
+        return hash((self.answer, self.guessed_mask))
+
+
+# --- Hangman Engine ---
+class HangmanEngine:
+    """The game rules without any display, sound or logging"""
+    __slots__ = ("word_data", "word_selector", "selected_category", "selected_difficulty",
+                 "category", "word", "answer", "hint", "state")
+    _word_data = None  # Shared by every game, loaded once per process
+
+    def __init__(self, word_selector, selected_category=None, selected_difficulty=None, word_data=None):
+        self.word_data = word_data if word_data is not None else self.load_words()
+        self.word_selector = word_selector
+        self.selected_category = selected_category
+        self.selected_difficulty = selected_difficulty
+
+    def reset_game(self):
+        # Get word/riddle from selector
+        self.category, self.word = self.word_selector.select_word(self.word_data)
+        # Set answer and hint
+        if self.category == "riddle":
+            self.answer = self.word["word"].lower()
+            self.hint = self.word["hint"]
+        else:
+            self.answer = self.word.lower()
+            self.hint = self.category
+        self.state = GameState(self.answer)
+
+    @staticmethod
+    def load_words():
+        if HangmanEngine._word_data is None:
+            try:
+                if is_stale(CORPUS_INDEX):
+                    build_index(load_sources(), CORPUS_INDEX)
+                HangmanEngine._word_data = CorpusIndex(CORPUS_INDEX)
+            except (OSError, ValueError):
+                # Read-only install without a usable compiled index, parse the JSON instead
+                with open(WORDS_FILE) as f:
+                    words_data = json.load(f)
+                with open(RIDDLES_FILE) as f:
+                    words_data["riddle"] = json.load(f)  # Add riddles as a category
+                HangmanEngine._word_data = words_data
+        return HangmanEngine._word_data
+
+    def guess(self, letter):
+        """Returns True for a correct guess, False for a wrong one, None if ignored or the game is over"""
+        return self.state.guess(letter)
+
+    @property
+    def guessed_letters(self):
+        return list(self.state.guessed)
+
+    @property
+    def incorrect_guesses(self):
+        return self.state.wrong
+
+    def get_display_word(self):
+        return self.state.display
+
+    def has_won(self):
+        return self.state.remaining == 0
+
+    def has_lost(self):
+        return self.state.wrong >= MAX_TRIES
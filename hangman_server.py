@@ -0,0 +1,132 @@
+# hangman_server.py
+# asyncio server hosting many Hangman sessions over plain TCP, one JSON object per line
+#
+# Requests                                            Responses
+#   {"op": "new", "category": "words", "difficulty": "easy"}   {"pattern": "____", "wrong": 0, "hint": "animal", "status": "playing"}
+#   {"op": "guess", "letter": "e"}                    {"result": "hit", "pattern": "_e__", "wrong": 0, "status": "playing"}
+#   {"op": "quit"}                                    (connection closed)
+# Errors come back as {"error": "..."}; "answer" is added once a game is lost.
+import argparse
+import asyncio
+import json
+from hangman_engine import HangmanEngine, RandomCategoryStrategy, ShuffleBagStrategy, load_difficulty_table
+from word_corpus import CorpusIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5050
+BACKLOG = 4096  # Pending connections, so thousands of clients can connect at once
+CATEGORIES = ("words", "riddle")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class HangmanServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        # One corpus and one strategy per (category, difficulty), shared by every session. A shared
+        # shuffle bag serves its whole bucket before repeating, so no session sees a word twice before that
+        self.word_data = HangmanEngine.load_words()
+        table = load_difficulty_table()  # Calibrated buckets when calibrate.py has been run
+        strategy = ShuffleBagStrategy if isinstance(self.word_data, CorpusIndex) else RandomCategoryStrategy
+        self.strategies = {(category, difficulty): strategy(category, difficulty, table=table)
+                           for category in CATEGORIES for difficulty in DIFFICULTIES + (None,)}
+        self.sessions = 0
+        self.games = 0
+        self.guesses = 0
+        self.server = None
+
+    def new_game(self, request):
+        key = (request.get("category") or "words", request.get("difficulty"))
+        if key[0] not in CATEGORIES or key[1] not in DIFFICULTIES + (None,):
+            return None, {"error": f"unknown category/difficulty {key}"}
+        strategy = self.strategies[key]
+        game = HangmanEngine(strategy, *key, word_data=self.word_data)
+        game.reset_game()
+        self.games += 1
+        return game, {"pattern": "".join(game.state.chars), "wrong": 0, "hint": game.hint, "status": "playing"}
+
+    def guess(self, game, request):
+        if game is None:
+            return {"error": "no game, send new first"}
+        if game.has_won() or game.has_lost():
+            return {"error": "game over, send new"}
+        letter = request.get("letter")
+        if not isinstance(letter, str) or len(letter) != 1 or not "a" <= letter.lower() <= "z":
+            return {"error": "letter must be a single letter a-z"}
+        correct = game.guess(letter.lower())
+        self.guesses += 1
+        response = {"result": "repeat" if correct is None else ("hit" if correct else "miss"),
+                    "pattern": "".join(game.state.chars), "wrong": game.incorrect_guesses,
+                    "status": "won" if game.has_won() else ("lost" if game.has_lost() else "playing")}
+        if response["status"] == "lost":
+            response["answer"] = game.answer
+        return response
+
+    def respond(self, game, line):
+        """Returns (the session's game, the response), or (game, None) when the client quits"""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return game, {"error": "bad json"}
+        if not isinstance(request, dict):
+            return game, {"error": "request must be a JSON object"}
+        op = request.get("op")
+        if op == "new":
+            new_game, response = self.new_game(request)
+            return new_game or game, response
+        if op == "guess":
+            return game, self.guess(game, request)
+        if op == "quit":
+            return game, None
+        return game, {"error": f"unknown op {op!r}"}
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        game = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Longer than the stream limit; the rest of it cannot be resynced
+                    writer.write(json.dumps({"error": "request too long"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                game, response = self.respond(game, line)
+                if response is None:
+                    break
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, backlog=BACKLOG)
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Serving Hangman on {self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host Hangman sessions over TCP")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    server = HangmanServer(args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print(f"Stopped after {server.games} games and {server.guesses} guesses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# letter_solver.py
+# Vectorized "best next letter" suggestions over a word corpus
+import argparse
+import random
+import string
+import time
+import numpy as np
+
+HIDDEN = "_"  # How GameState.chars shows a letter that is not revealed yet
+OTHER = 26  # Code for anything that is not a-z (spaces, apostrophes, ...)
+
+# Byte -> letter code lookup, a-z map to 0-25
+LETTER_CODES = np.full(256, OTHER, dtype=np.uint8)
+LETTER_CODES[np.frombuffer(string.ascii_lowercase.encode(), dtype=np.uint8)] = np.arange(26, dtype=np.uint8)
+
+
+def encode(text):
+    """One byte per character, so positions line up with the answer"""
+    return np.frombuffer(text.encode("ascii", "replace"), dtype=np.uint8)
+
+
+def pack(rows):
+    """Packs a (k, words) bool array into (k, ceil(words / 64)) uint64 bitsets"""
+    packed = np.packbits(rows, axis=-1, bitorder="little")
+    padding = -packed.shape[-1] % 8
+    if padding:
+        packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, padding)])
+    return packed.view(np.uint64)
+
+
+if hasattr(np, "bitwise_count"):
+    def popcount(bitsets):
+        return np.bitwise_count(bitsets).sum(axis=-1, dtype=np.int64)
+else:  # NumPy < 2.0
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(bitsets):
+        return _BYTE_COUNTS[bitsets.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+class LetterGroup:
+    """Bitsets over all words of one length: one per (letter, position) and one per letter"""
+
+    def __init__(self, words):
+        length = len(words[0])
+        codes = LETTER_CODES[encode("".join(words))].reshape(len(words), length)
+        letters = np.arange(OTHER + 1, dtype=np.uint8)[:, None]
+        # at[letter, position] has a bit set for every word with that letter at that position
+        self.at = np.stack([pack(codes[:, position] == letters) for position in range(length)], axis=1)
+        # has[letter] is the words x letters bit matrix, one bitset per letter
+        self.has = np.bitwise_or.reduce(self.at, axis=1)
+        self.valid = pack(np.ones(len(words), dtype=bool)[None, :])[0]
+
+
+class LetterSolver:
+    """Words x letters bit matrices grouped by answer length"""
+
+    def __init__(self, answers):
+        by_length = {}
+        for answer in dict.fromkeys(answers):
+            if answer:
+                by_length.setdefault(len(answer), []).append(answer)
+        self.groups = {length: LetterGroup(words) for length, words in by_length.items()}
+        self.size = sum(len(words) for words in by_length.values())
+
+    def candidates(self, pattern, guessed):
+        """Returns the bitset of words of len(pattern) still consistent with the game, or None"""
+        group = self.groups.get(len(pattern))
+        if group is None:
+            return None
+        raw = encode(pattern)
+        shown = LETTER_CODES[raw].astype(np.int16)
+        shown[raw == ord(HIDDEN)] = -1
+        # Every guessed letter, and the non-letters, must sit exactly where the pattern shows them
+        letters = np.unique(np.append(LETTER_CODES[encode(guessed)], OTHER))
+        expected = shown[None, :] == letters[:, None]
+        at = group.at[letters]
+        matches = np.where(expected[:, :, None], at, ~at)
+        return np.bitwise_and.reduce(matches.reshape(-1, matches.shape[-1]), axis=0) & group.valid
+
+    def analyze(self, pattern, guessed=""):
+        """Returns (the unguessed letter found in the most remaining candidates or None, candidate count)"""
+        candidates = self.candidates(pattern, guessed)
+        if candidates is None:
+            return None, 0
+        counts = popcount(self.groups[len(pattern)].has[:OTHER] & candidates)
+        if guessed:
+            counts[LETTER_CODES[encode(guessed)]] = -1
+        best = int(counts.argmax())
+        remaining = int(popcount(candidates))
+        return (string.ascii_lowercase[best] if counts[best] > 0 else None), remaining
+
+    def suggest(self, pattern, guessed=""):
+        """Returns the unguessed letter found in the most remaining candidates, or None"""
+        return self.analyze(pattern, guessed)[0]
+
+    def suggest_for(self, state):
+        """Suggestion for a GameState"""
+        return self.suggest("".join(state.chars), state.guessed)
+
+
+# --- Benchmark ---
+def random_corpus(size, rng):
+    weights = [12.7, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.2, 0.8, 4.0, 2.4,
+               6.7, 7.5, 1.9, 0.1, 6.0, 6.3, 9.1, 2.8, 1.0, 2.4, 0.2, 2.0, 0.1]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, weights, k=rng.randint(3, 12))))
+    return list(words)
+
+
+def benchmark(sizes, queries=200, seed=0):
+    rng = random.Random(seed)
+    print(f"{'words':>8} {'build ms':>9} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for size in sizes:
+        corpus = random_corpus(size, rng)
+        start = time.perf_counter()
+        solver = LetterSolver(corpus)
+        build = time.perf_counter() - start
+        solver.suggest(HIDDEN * 3)  # Warm up NumPy before timing
+        timings = []
+        for answer in rng.sample(corpus, min(queries, size)):
+            guessed = "".join(rng.sample(string.ascii_lowercase, rng.randint(0, 8)))
+            pattern = "".join(char if char in guessed else HIDDEN for char in answer)
+            start = time.perf_counter()
+            solver.suggest(pattern, guessed)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{size:>8} {build * 1e3:>9.1f} {timings[len(timings) // 2] * 1e6:>8.0f} "
+              f"{timings[int(len(timings) * 0.99)] * 1e6:>8.0f} {timings[-1] * 1e6:>8.0f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hint suggestion latency against corpus size")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+    benchmark(args.sizes, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# load_test.py
+# Opens many concurrent sessions against hangman_server.py and reports throughput and latency
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from hangman_server import DEFAULT_HOST, DEFAULT_PORT
+
+ENGLISH_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+async def request(reader, writer, message, latencies):
+    start = time.perf_counter()
+    writer.write(json.dumps(message).encode() + b"\n")
+    response = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - start)
+    return response
+
+
+async def play_session(host, port, games, latencies, rng):
+    """Plays games on one connection, guessing letters in English frequency order"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            game = await request(reader, writer, {"op": "new", "category": rng.choice(["words", "riddle"]),
+                                                  "difficulty": rng.choice(["easy", "medium", "hard"])}, [])
+            status = game["status"]
+            for letter in ENGLISH_ORDER:
+                if status != "playing":
+                    break
+                status = (await request(reader, writer, {"op": "guess", "letter": letter}, latencies))["status"]
+        writer.write(b'{"op": "quit"}\n')
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def wait_for_server(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(host, port, sessions, games, seed):
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play_session(host, port, games, latencies, random.Random(rng.random()))
+                                     for _ in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = [result for result in results if isinstance(result, Exception)]
+    return latencies, elapsed, errors
+
+
+def report(latencies, elapsed, errors, sessions):
+    latencies.sort()
+    if not latencies:
+        print(f"No guesses completed, {len(errors)} session errors: {errors[:3]}")
+        return
+    print(f"{sessions} sessions, {len(latencies)} guesses in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} guesses/s), {len(errors)} failed sessions")
+    print(f"Guess latency: p50={latencies[len(latencies) // 2] * 1e3:.2f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99)] * 1e3:.2f}ms max={latencies[-1] * 1e3:.2f}ms")
+    if errors:
+        print(f"First error: {errors[0]!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test hangman_server.py with concurrent sessions")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=5, help="Games played per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="Start a local server process for the run")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hangman_server.py")
+        server = subprocess.Popen([sys.executable, script, "--host", args.host,
+                                   "--port", str(args.port)], stdout=subprocess.DEVNULL)
+    try:
+        if server:
+            asyncio.run(wait_for_server(args.host, args.port))
+        report(*asyncio.run(run(args.host, args.port, args.sessions, args.games, args.seed)), args.sessions)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
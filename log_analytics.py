@@ -0,0 +1,308 @@
+# log_analytics.py
+# Streaming statistics over the game_log.txt written by Logger
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+from hangman_engine import MAX_TRIES
+from word_corpus import RIDDLES_FILE, WORDS_FILE, load_sources
+DEFAULT_LOG = "game_log.txt"
+DEFAULT_CHECKPOINT = "game_log.checkpoint.json"
+
+# "[2025-05-08 20:58:27] New game started. Category: Only useful once it's broken., Word: egg"
+OLD_NEW_GAME = re.compile(r"New game started\. Category: (.*), Word: (.*)$")
+# "[2025-05-15 20:21:22] New game: Category=riddle, Word=shadow, Difficulty=easy" (older lines end at Word)
+NEW_GAME = re.compile(r"New game: Category=(.*), Word=(.*?)(?:, Difficulty=(\w+))?$")
+GUESS = re.compile(r"(Correct|Wrong) guess: (.)$")
+
+
+def empty_stats():
+    return {"games": 0, "wins": 0, "losses": 0, "guesses": 0, "wrong": 0}
+
+
+def file_head(path):
+    """Hash of a log file's first complete line; identifies the file after Logger renames it to .1 ... .N"""
+    with open(path, "rb") as f:
+        line = f.readline()
+    return hashlib.sha1(line).hexdigest() if line.endswith(b"\n") else None
+
+
+def log_segments(path):
+    """The rotated backups of a log, oldest first, then the log itself"""
+    backups = []
+    while os.path.exists(f"{path}.{len(backups) + 1}"):
+        backups.append(f"{path}.{len(backups) + 1}")
+    return backups[::-1] + ([path] if os.path.exists(path) else [])
+
+
+def corpus_difficulties(words_path=WORDS_FILE, riddles_path=RIDDLES_FILE):
+    """{(category, answer): difficulty} from the word lists, for log lines that predate the Difficulty field"""
+    try:
+        groups = load_sources(words_path, riddles_path)
+    except (OSError, ValueError):
+        return {}
+    difficulties = {}
+    for (category, difficulty), entries in groups.items():
+        for answer, _ in entries:
+            difficulties.setdefault((category, answer), difficulty)
+    return difficulties
+
+
+# --- Session ---
+class Session:
+    """One game being replayed from the log"""
+
+    def __init__(self, category, word, difficulty="unknown"):
+        self.category = category
+        self.word = word
+        self.difficulty = difficulty
+        self.guessed = set()
+        self.wrong = 0
+        self.letters = set(word) - {" "}
+
+    def guess(self, letter, correct):
+        if letter in self.guessed:
+            return
+        self.guessed.add(letter)
+        if not correct:
+            self.wrong += 1
+
+    def outcome(self):
+        if self.letters <= self.guessed:
+            return "win"
+        if self.wrong >= MAX_TRIES:
+            return "loss"
+        return "abandoned"
+
+    def to_dict(self):
+        return {"category": self.category, "word": self.word, "difficulty": self.difficulty,
+                "guessed": sorted(self.guessed), "wrong": self.wrong}
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data["category"], data["word"], data["difficulty"])
+        session.guessed = set(data["guessed"])
+        session.wrong = data["wrong"]
+        return session
+
+
+# --- Analytics Engine ---
+class LogAnalytics:
+    def __init__(self, log_path=DEFAULT_LOG, checkpoint_path=DEFAULT_CHECKPOINT):
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path
+        self.difficulties = None  # Corpus lookup for lines without a difficulty, loaded on first need
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.head = None  # file_head of the segment offset points into
+        self.totals = empty_stats()
+        self.totals["abandoned"] = 0
+        self.groups = {}  # "category/difficulty" -> stats
+        self.words = {}  # word -> stats
+        self.letters = {}  # letter -> [correct, wrong]
+        self.session = None
+
+    # --- Checkpoints ---
+    def load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path) as f:
+            data = json.load(f)
+        if data.get("log_path") != os.path.abspath(self.log_path) or "head" not in data:
+            return False  # Different log, or a checkpoint without a file identity: start over
+        self.offset = data["offset"]
+        self.head = data["head"]
+        self.totals = data["totals"]
+        self.groups = data["groups"]
+        self.words = data["words"]
+        self.letters = data["letters"]
+        self.session = Session.from_dict(data["session"]) if data["session"] else None
+        return True
+
+    def save_checkpoint(self):
+        data = {
+            "log_path": os.path.abspath(self.log_path),
+            "offset": self.offset,
+            "head": self.head,
+            "totals": self.totals,
+            "groups": self.groups,
+            "words": self.words,
+            "letters": self.letters,
+            "session": self.session.to_dict() if self.session else None,
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.checkpoint_path)  # Never leave a half-written checkpoint
+
+    # --- Parsing ---
+    def process(self):
+        """Consumes every complete line appended since the last checkpoint, following rotations"""
+        segments = log_segments(self.log_path)
+        heads = [file_head(path) for path in segments]
+        start = 0
+        if self.head is not None:
+            if self.head in heads:
+                start = heads.index(self.head)  # The checkpointed file, under whatever name it has now
+                if os.path.getsize(segments[start]) < self.offset:
+                    self.reset()  # Rewritten in place, start over
+                    start = 0
+            else:
+                self.offset = 0  # Rotated out entirely; every remaining segment is newer
+        lines = 0
+        for path, head in zip(segments[start:], heads[start:]):
+            if head != self.head:
+                if head is None:
+                    break  # No complete line yet; keep pointing at the end of the previous segment
+                self.head, self.offset = head, 0
+            lines += self.process_segment(path)
+        return lines
+
+    def process_segment(self, path):
+        if os.path.getsize(path) <= self.offset:
+            return 0
+        lines = 0
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = self.offset
+            end = len(mm)
+            while pos < end:
+                newline = mm.find(b"\n", pos)
+                if newline == -1:
+                    break  # Partial line still being written, pick it up next run
+                self.parse_line(mm[pos:newline].decode("utf-8", errors="replace").rstrip("\r"))
+                pos = newline + 1
+                lines += 1
+            self.offset = pos
+        return lines
+
+    def parse_line(self, line):
+        if line.startswith("{"):
+            self.parse_record(json.loads(line))
+            return
+        message = line.split("] ", 1)[-1]
+        match = NEW_GAME.match(message) or OLD_NEW_GAME.match(message)
+        if match:
+            category, word, difficulty = (match.groups() + (None,))[:3]
+            # The old format logged the riddle text itself as the category
+            if not (category.isalpha() and category.islower()):
+                category = "riddle"
+            self.start_session(category, word.lower(), difficulty)
+            return
+        match = GUESS.match(message)
+        if match:
+            self.record_guess(match.group(2), match.group(1) == "Correct")
+
+    def parse_record(self, record):
+        """Handles a JSON Lines record from Logger with LOG_FORMAT = "jsonl\""""
+        if record.get("event") == "new_game":
+            self.start_session(record["category"], record["word"], record.get("difficulty"))
+        elif record.get("event") == "guess":
+            self.record_guess(record["letter"], record["correct"])
+
+    # --- Aggregation ---
+    def infer_difficulty(self, category, word):
+        """The word's bucket in the corpus, or "unknown" if it is not (or no longer) in it"""
+        if self.difficulties is None:
+            self.difficulties = corpus_difficulties()
+        return self.difficulties.get((category, word), "unknown")
+
+    def start_session(self, category, word, difficulty=None):
+        self.finish_session()
+        if not difficulty or difficulty == "unknown":
+            difficulty = self.infer_difficulty(category, word)
+        self.session = Session(category, word, difficulty)
+
+    def record_guess(self, letter, correct):
+        if self.session is None or letter in self.session.guessed:
+            return
+        if self.session.outcome() != "abandoned":
+            return  # Older builds kept accepting keys after the game ended
+        self.session.guess(letter, correct)
+        counts = self.letters.setdefault(letter, [0, 0])
+        counts[0 if correct else 1] += 1
+
+    def finish_session(self):
+        session, self.session = self.session, None
+        if session is None:
+            return
+        outcome = session.outcome()
+        if outcome == "abandoned":
+            self.totals["abandoned"] += 1
+            return
+        group = self.groups.setdefault(f"{session.category}/{session.difficulty}", empty_stats())
+        word = self.words.setdefault(session.word, empty_stats())
+        for stats in (self.totals, group, word):
+            stats["games"] += 1
+            stats["wins" if outcome == "win" else "losses"] += 1
+            stats["guesses"] += len(session.guessed)
+            stats["wrong"] += session.wrong
+
+    def run(self, resume=True):
+        if not (resume and self.load_checkpoint()):
+            self.reset()
+        lines = self.process()
+        if self.checkpoint_path:
+            self.save_checkpoint()
+        return lines
+
+    # --- Reporting ---
+    def report(self):
+        """Aggregates so far; the game still in progress at the end of the log is not counted"""
+        def summarize(stats):
+            games = stats["games"]
+            return dict(stats,
+                        win_rate=stats["wins"] / games if games else 0.0,
+                        avg_guesses=stats["guesses"] / games if games else 0.0,
+                        avg_wrong=stats["wrong"] / games if games else 0.0)
+
+        return {
+            "totals": summarize(self.totals),
+            "groups": {key: summarize(stats) for key, stats in sorted(self.groups.items())},
+            "words": {key: summarize(stats) for key, stats in sorted(self.words.items())},
+            "letters": {letter: {"correct": c, "wrong": w, "total": c + w}
+                        for letter, (c, w) in sorted(self.letters.items(), key=lambda i: -sum(i[1]))},
+        }
+
+
+def print_report(report, top=10):
+    totals = report["totals"]
+    print(f"Games: {totals['games']}  Wins: {totals['wins']}  Losses: {totals['losses']}  "
+          f"Abandoned: {totals['abandoned']}  Win rate: {totals['win_rate']:.1%}  "
+          f"Avg guesses: {totals['avg_guesses']:.2f}")
+    print("\nBy category/difficulty (hardest first):")
+    for key, stats in sorted(report["groups"].items(), key=lambda i: i[1]["win_rate"]):
+        print(f"  {key:<20} games={stats['games']:<5} win_rate={stats['win_rate']:.1%} "
+              f"avg_wrong={stats['avg_wrong']:.2f}")
+    print(f"\nHardest words (top {top}):")
+    words = sorted(report["words"].items(), key=lambda i: (-i[1]["avg_wrong"], -i[1]["games"]))
+    for word, stats in words[:top]:
+        print(f"  {word:<20} games={stats['games']:<4} avg_wrong={stats['avg_wrong']:.2f} "
+              f"avg_guesses={stats['avg_guesses']:.2f}")
+    print("\nMost guessed letters:")
+    print("  " + " ".join(f"{letter}:{stats['total']}" for letter, stats in list(report["letters"].items())[:top]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Win rates and guess statistics from the Hangman game log")
+    parser.add_argument("log", nargs="?", default=DEFAULT_LOG)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT,
+                        help="Where to keep the resume offset and partial aggregates")
+    parser.add_argument("--reset", action="store_true", help="Ignore the checkpoint and rescan the whole log")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    analytics = LogAnalytics(args.log, args.checkpoint)
+    analytics.run(resume=not args.reset)
+    if args.json:
+        print(json.dumps(analytics.report(), indent=2))
+    else:
+        print_report(analytics.report(), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+# replay.py
+# Deterministic session recording and headless replay for HangmanApp
+#
+# Layout (little-endian): header, then records, then the seek index and a trailer
+#   header   magic "HRPL", version, session seed, created (epoch seconds)
+#   record   kind, frame, milliseconds since start, payload length, payload
+#            EVENT     one pygame input event
+#            STATE     app state after a frame in which it changed
+#            KEYFRAME  STATE plus the word of a game that just started; the seek index points at these
+#            FRAME     end of a frame, with how long dispatch and rendering took in microseconds
+#   index    count, then (game number, frame, record offset) per keyframe
+#   trailer  index offset, magic "HRIX"
+# A recording cut short by a crash has no index; the reader rebuilds it by scanning.
+import argparse
+import os
+import struct
+import sys
+import time
+
+MAGIC = b"HRPL"
+INDEX_MAGIC = b"HRIX"
+VERSION = 1
+HEADER = struct.Struct("<4sHQd")  # magic, version, seed, created
+RECORD = struct.Struct("<BIIH")  # kind, frame, ms since start, payload length
+EVENT = struct.Struct("<HihhHB")  # type, key, x, y, mod, button; unicode text follows
+STATE = struct.Struct("<BBB")  # screen, wrong guesses, sound on; NUL-separated strings follow
+KEYFRAME = struct.Struct("<I")  # game number, then a STATE payload with the word's category and hint
+FRAME = struct.Struct("<I")  # microseconds spent on the frame
+INDEX_ENTRY = struct.Struct("<IIQ")  # game number, frame, record offset
+TRAILER = struct.Struct("<Q4s")  # index offset, magic
+
+EVENT_KIND, STATE_KIND, KEYFRAME_KIND, FRAME_KIND = 1, 2, 3, 4
+MIN_PAYLOAD = {EVENT_KIND: EVENT.size, STATE_KIND: STATE.size, KEYFRAME_KIND: KEYFRAME.size + STATE.size,
+               FRAME_KIND: FRAME.size}
+SCREENS = ["menu", "categories", "difficulty", "game", "stats"]
+RECORD_ENV = "HANGMAN_RECORD"  # Set to a file path to record the session there
+SEED_ENV = "HANGMAN_SEED"  # Set to replay a session's word choices, otherwise a random seed is drawn
+
+
+class ReplayMismatch(Exception):
+    def __init__(self, frame, expected, actual):
+        super().__init__(f"frame {frame}: expected {expected}, replay has {actual}")
+        self.frame = frame
+        self.expected = expected
+        self.actual = actual
+
+
+def session_seed():
+    seed = os.environ.get(SEED_ENV)
+    return int(seed) if seed else int.from_bytes(os.urandom(8), "little")
+
+
+# --- Payloads ---
+def encode_event(event):
+    x, y = getattr(event, "pos", (0, 0))
+    head = EVENT.pack(event.type, getattr(event, "key", 0), x, y, getattr(event, "mod", 0),
+                      getattr(event, "button", 0))
+    return head + getattr(event, "unicode", "").encode("utf-8")
+
+
+def decode_event(payload):
+    import pygame
+    event_type, key, x, y, mod, button = EVENT.unpack_from(payload)
+    if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+        attributes = {"key": key, "mod": mod, "unicode": payload[EVENT.size:].decode("utf-8")}
+    elif event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        attributes = {"pos": (x, y), "button": button}
+    elif event_type == pygame.MOUSEMOTION:
+        attributes = {"pos": (x, y), "rel": (0, 0), "buttons": (0, 0, 0)}
+    else:
+        attributes = {}
+    return pygame.event.Event(event_type, attributes)
+
+
+def encode_state(state):
+    """state: (screen, category, difficulty, answer, guessed, wrong, sound on)"""
+    screen, category, difficulty, answer, guessed, wrong, sound_on = state
+    text = "\0".join([category, difficulty, answer, guessed])
+    return STATE.pack(SCREENS.index(screen), wrong, sound_on) + text.encode("utf-8")
+
+
+def decode_state(payload):
+    screen, wrong, sound_on = STATE.unpack_from(payload)
+    category, difficulty, answer, guessed = payload[STATE.size:].decode("utf-8").split("\0")[:4]
+    return SCREENS[screen], category, difficulty, answer, guessed, wrong, bool(sound_on)
+
+
+def encode_keyframe(games, state, word):
+    """word: (category, hint) of the game that just started"""
+    return KEYFRAME.pack(games) + encode_state(state) + ("\0" + "\0".join(word)).encode("utf-8")
+
+
+def decode_keyframe(payload):
+    games, = KEYFRAME.unpack_from(payload)
+    state = decode_state(payload[KEYFRAME.size:])
+    category, hint = payload[KEYFRAME.size + STATE.size:].decode("utf-8").split("\0")[4:6]
+    return games, state, (category, hint)
+
+
+# --- Writer ---
+class ReplayWriter:
+    """Appends a session's events and state transitions to a replay file"""
+
+    def __init__(self, path, seed):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, time.time()))
+        self.started = time.perf_counter()
+        self.frame = 0
+        self.state = None
+        self.games = 0
+        self.index = []
+        self.closed = False
+
+    def _write(self, kind, payload):
+        elapsed = int((time.perf_counter() - self.started) * 1000)
+        self.file.write(RECORD.pack(kind, self.frame, elapsed, len(payload)) + payload)
+
+    def event(self, event):
+        self._write(EVENT_KIND, encode_event(event))
+
+    def end_frame(self, state, games, word, rendered, duration, had_events):
+        """Records state if it changed (as a keyframe when a new game started) and closes the frame"""
+        changed = state != self.state
+        if games != self.games:
+            self.index.append((games, self.frame, self.file.tell()))
+            self._write(KEYFRAME_KIND, encode_keyframe(games, state, word))
+        elif changed:
+            self._write(STATE_KIND, encode_state(state))
+        if changed or rendered or had_events or games != self.games:
+            self._write(FRAME_KIND, FRAME.pack(min(int(duration * 1e6), 0xFFFFFFFF)))
+        self.state = state
+        self.games = games
+        self.frame += 1
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        offset = self.file.tell()
+        self.file.write(struct.pack("<I", len(self.index)))
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(TRAILER.pack(offset, INDEX_MAGIC))
+        self.file.close()
+
+
+# --- Reader ---
+class ReplayReader:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = f.read()
+        magic, version, self.seed, self.created = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        self.end = len(self.data)
+        self.index = self._read_index()
+
+    def _read_index(self):
+        if self.end >= HEADER.size + TRAILER.size:
+            offset, magic = TRAILER.unpack_from(self.data, self.end - TRAILER.size)
+            if magic == INDEX_MAGIC:
+                count, = struct.unpack_from("<I", self.data, offset)
+                self.end = offset
+                return [INDEX_ENTRY.unpack_from(self.data, offset + 4 + i * INDEX_ENTRY.size)
+                        for i in range(count)]
+        index = []  # No trailer: the session did not shut down cleanly
+        for offset, kind, frame, _, payload in self.records():
+            if kind == KEYFRAME_KIND:
+                index.append((KEYFRAME.unpack_from(payload)[0], frame, offset))
+        return index
+
+    def records(self, offset=HEADER.size):
+        """Yields (offset, kind, frame, ms, payload) from offset, stopping at a truncated or corrupt record"""
+        while offset + RECORD.size <= self.end:
+            kind, frame, elapsed, length = RECORD.unpack_from(self.data, offset)
+            start = offset + RECORD.size
+            if start + length > self.end or length < MIN_PAYLOAD.get(kind, 1 << 16):
+                return
+            yield offset, kind, frame, elapsed, self.data[start:start + length]
+            offset = start + length
+
+    def frames(self, offset=HEADER.size):
+        """Yields (frame, events, expected state or None, recorded microseconds) per recorded frame"""
+        events = []
+        state = None
+        for _, kind, frame, _, payload in self.records(offset):
+            if kind == EVENT_KIND:
+                events.append(decode_event(payload))
+            elif kind == STATE_KIND:
+                state = decode_state(payload)
+            elif kind == KEYFRAME_KIND:
+                state = decode_keyframe(payload)[1]
+            elif kind == FRAME_KIND:
+                yield frame, events, state, FRAME.unpack(payload)[0]
+                events = []
+                state = None
+
+    def keyframe(self, game):
+        """Returns (offset just past the keyframe, games, state, word) for a game number"""
+        for number, _, offset in self.index:
+            if number == game:
+                _, kind, _, _, payload = next(self.records(offset))
+                return offset + RECORD.size + len(payload), *decode_keyframe(payload)
+        raise KeyError(f"no game {game} in the recording (games: {[entry[0] for entry in self.index]})")
+
+    def words_from(self, game):
+        """(category, answer, hint) of every game from a game number on, in play order"""
+        words = []
+        for number, _, offset in self.index:
+            if number >= game:
+                _, _, _, _, payload = next(self.records(offset))
+                _, state, (category, hint) = decode_keyframe(payload)
+                words.append((category, state[3], hint))
+        return words
+
+
+class RecordedStrategy:
+    """Serves the recorded words in order, for replays that start at a keyframe"""
+
+    def __init__(self, words):
+        self.words = list(words)
+
+    def select_word(self, word_data):
+        category, answer, hint = self.words.pop(0)
+        if category == "riddle":
+            return "riddle", {"word": answer, "hint": hint}
+        return category, answer
+
+
+# --- Replayer ---
+class Replayer:
+    """Re-executes a recording through HangmanApp as fast as frames render, checking state per frame"""
+
+    def __init__(self, path, verify=True, start_game=None):
+        import categorized_code
+        categorized_code.LOG_FILE = os.devnull  # Keep replayed guesses out of the real log
+        categorized_code.STATS_FILE = ":memory:"  # ... and replayed games out of the stats database
+        self.cc = categorized_code
+        self.reader = ReplayReader(path)
+        self.verify = verify
+        self.start_game = start_game
+        self.app = categorized_code.HangmanApp(seed=self.reader.seed)
+        self.timings = []  # (frame, replayed microseconds, recorded microseconds)
+
+    def seek(self, game):
+        """Puts the app where a recorded game started, returns the offset to replay from"""
+        offset, _, state, _ = self.reader.keyframe(game)
+        app = self.app
+        strategy = RecordedStrategy(self.reader.words_from(game))
+        for category in ("words", "riddle"):
+            for difficulty in ("easy", "medium", "hard"):
+                app.strategies[(category, difficulty)] = strategy
+        screen, category, difficulty = state[:3]
+        if app.sound_on != state[6]:
+            app.toggle_sound()
+        app.selected_category = category
+        app.games_started = game - 1
+        app.select_difficulty(difficulty)
+        return offset
+
+    def run(self):
+        app = self.app
+        offset = self.seek(self.start_game) if self.start_game else HEADER.size
+        app.loader.wait()
+        expected = app.replay_state()
+        for frame, events, state, recorded in self.reader.frames(offset):
+            start = time.perf_counter()
+            app.step(events)
+            self.timings.append((frame, int((time.perf_counter() - start) * 1e6), recorded))
+            if state is not None:
+                expected = state
+            if self.verify and app.replay_state() != expected:
+                raise ReplayMismatch(frame, expected, app.replay_state())
+            if not app.running:
+                break
+        return self.timings
+
+
+def report(timings, top):
+    if not timings:
+        print("No frames replayed")
+        return
+    replayed = sorted(timing[1] for timing in timings)
+    recorded = sorted(timing[2] for timing in timings)
+    for name, samples in (("replayed", replayed), ("recorded", recorded)):
+        print(f"{name:<9} p50={samples[len(samples) // 2] / 1e3:.2f}ms "
+              f"p99={samples[int(len(samples) * 0.99)] / 1e3:.2f}ms max={samples[-1] / 1e3:.2f}ms")
+    print("\nSlowest recorded frames:")
+    for frame, replay_us, record_us in sorted(timings, key=lambda timing: -timing[2])[:top]:
+        print(f"  frame {frame:<7} recorded={record_us / 1e3:7.2f}ms replayed={replay_us / 1e3:7.2f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded Hangman session headlessly")
+    parser.add_argument("recording")
+    parser.add_argument("--from-game", type=int, help="Seek to this game number instead of replaying from launch")
+    parser.add_argument("--no-verify", action="store_true", help="Skip per-frame state checks")
+    parser.add_argument("--info", action="store_true", help="Describe the recording without replaying it")
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if args.info:
+        reader = ReplayReader(args.recording)
+        frames = sum(1 for _ in reader.frames())
+        print(f"seed={reader.seed} recorded {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(reader.created))}"
+              f", {frames} frames, {len(reader.index)} games")
+        for number, frame, _ in reader.index:
+            print(f"  game {number} from frame {frame}")
+        return 0
+
+    replayer = Replayer(args.recording, not args.no_verify, args.from_game)
+    start = time.perf_counter()
+    try:
+        timings = replayer.run()
+    except ReplayMismatch as error:
+        print(f"Replay diverged at {error}")
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {len(timings)} frames in {elapsed:.2f}s" + ("" if args.no_verify else ", state matched"))
+    report(timings, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# simulator.py
+# Headless batch simulation of Hangman games across a process pool
+import argparse
+import multiprocessing
+import os
+import random
+import string
+import struct
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from hangman_engine import MAX_TRIES, GameState, HangmanEngine
+from word_corpus import CORPUS_INDEX, CorpusIndex
+
+# One record per game: entry id, wrong guesses, total guesses
+RESULT = struct.Struct("<IBB")
+CHUNK_SIZE = 10_000  # Games per task handed to a worker
+# Letters by frequency in English text
+ENGLISH_ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+# --- Guessing Policies ---
+class GuessPolicy(ABC):
+    def __init__(self, answers):
+        self.answers = answers
+
+    @abstractmethod
+    def choose(self, state, rng):
+        """Returns the next letter to guess for a GameState"""
+        pass
+
+
+class RandomPolicy(GuessPolicy):
+    def choose(self, state, rng):
+        return rng.choice([letter for letter in string.ascii_lowercase if letter not in state.guessed])
+
+
+class FixedOrderPolicy(GuessPolicy):
+    order = ENGLISH_ORDER
+
+    def choose(self, state, rng):
+        for letter in self.order:
+            if letter not in state.guessed:
+                return letter
+
+
+class CorpusFrequencyPolicy(FixedOrderPolicy):
+    """Guesses letters in order of how many corpus answers contain them"""
+
+    def __init__(self, answers):
+        super().__init__(answers)
+        counts = Counter(letter for answer in answers for letter in set(answer) if letter.isalpha())
+        self.order = "".join(sorted(string.ascii_lowercase, key=lambda letter: -counts[letter]))
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "english": FixedOrderPolicy,
+    "corpus": CorpusFrequencyPolicy,
+}
+
+
+def play(answer, policy, rng):
+    state = GameState(answer)
+    while not (state.has_won() or state.has_lost()):
+        state.guess(policy.choose(state, rng))
+    return state
+
+
+# --- Worker Process ---
+_worker = {}
+
+
+def init_worker(index_path, entry_ids, policy_name):
+    index = CorpusIndex(index_path)
+    answers = {entry_id: index.entry(entry_id)[1] for entry_id in set(entry_ids)}
+    _worker["entry_ids"] = entry_ids
+    _worker["answers"] = answers
+    _worker["policy"] = POLICIES[policy_name](list(answers.values()))
+
+
+def run_chunk(task):
+    """Plays games [start, start + count); game i uses word i mod the number of words"""
+    seed, start, count = task
+    entry_ids = _worker["entry_ids"]
+    answers = _worker["answers"]
+    policy = _worker["policy"]
+    rng = random.Random(seed * 1_000_003 + start)  # Same results whatever the worker count
+    out = bytearray(RESULT.size * count)
+    for offset in range(count):
+        entry_id = entry_ids[(start + offset) % len(entry_ids)]
+        state = play(answers[entry_id], policy, rng)
+        RESULT.pack_into(out, offset * RESULT.size, entry_id, state.wrong, len(state.guessed))
+    return bytes(out)
+
+
+# --- Batch Simulator ---
+class BatchSimulator:
+    def __init__(self, index_path=CORPUS_INDEX, category=None, difficulty=None, policy="corpus",
+                 workers=None, seed=0):
+        if index_path == CORPUS_INDEX:
+            HangmanEngine.load_words()  # Builds the index if it is missing or stale
+        self.index_path = index_path
+        index = CorpusIndex(index_path)
+        if category is None:
+            categories = list(index.keys())
+        elif category == "words":
+            categories = [cat for cat in index.keys() if cat != "riddle"]
+        else:
+            categories = [category]
+        self.entry_ids = array("I")
+        for first, count in index.ranges(categories, difficulty):
+            self.entry_ids.extend(range(first, first + count))
+        if not self.entry_ids:
+            raise ValueError(f"No words for category={category} difficulty={difficulty}")
+        self.index = index
+        self.policy = policy
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+
+    def run(self, games, output=None, chunk_size=CHUNK_SIZE):
+        """Plays games across the pool, streaming packed results to output, returns per-word totals"""
+        tasks = [(self.seed, start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+        totals = {}  # entry id -> [games, wins, wrong guesses]
+        out = open(output, "wb") if output else None
+        try:
+            with multiprocessing.Pool(self.workers, init_worker,
+                                      (self.index_path, self.entry_ids, self.policy)) as pool:
+                for chunk in pool.imap_unordered(run_chunk, tasks):
+                    if out:
+                        out.write(chunk)
+                    for entry_id, wrong, _ in RESULT.iter_unpack(chunk):
+                        stats = totals.setdefault(entry_id, [0, 0, 0])
+                        stats[0] += 1
+                        stats[1] += wrong < MAX_TRIES
+                        stats[2] += wrong
+        finally:
+            if out:
+                out.close()
+        return totals
+
+
+def read_results(path):
+    """Yields (entry id, wrong guesses, total guesses) from a simulator output file"""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(RESULT.size * CHUNK_SIZE)
+            if not data:
+                break
+            yield from RESULT.iter_unpack(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play Hangman games headlessly with a guessing policy")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="corpus")
+    parser.add_argument("--category", help="riddle, words, or a word category such as animal")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard"])
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write packed per-game results here")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    simulator = BatchSimulator(category=args.category, difficulty=args.difficulty, policy=args.policy,
+                               workers=args.workers, seed=args.seed)
+    start = time.perf_counter()
+    totals = simulator.run(args.games, args.output)
+    elapsed = time.perf_counter() - start
+
+    games = sum(stats[0] for stats in totals.values())
+    wins = sum(stats[1] for stats in totals.values())
+    print(f"{games} games in {elapsed:.2f}s ({games / elapsed:,.0f} games/s) on {simulator.workers} workers")
+    print(f"Win rate: {wins / games:.1%}")
+    print(f"\nHardest words for the {args.policy} policy:")
+    ranked = sorted(totals.items(), key=lambda item: (item[1][1] / item[1][0], -item[1][2] / item[1][0]))
+    for entry_id, (played, won, wrong) in ranked[:args.top]:
+        category, answer, _ = simulator.index.entry(entry_id)
+        print(f"  {answer:<20} {category:<8} win_rate={won / played:.1%} avg_wrong={wrong / played:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# sprite_atlas.py
+# Packs the game's sprites into texture atlas pages, pre-scaled for several window resolutions
+import argparse
+import json
+import os
+import pygame
+from hangman_engine import MAX_TRIES
+
+ASSET_DIR = "assets1"
+ATLAS_FILE = "sprites.json"  # Layout; each page's pixels go next to it as sprites-<page>@<scale>x.png
+VERSION = 1
+BASE_RESOLUTION = (800, 600)  # Window size the sprites and their sizes are authored for
+SCALES = (1, 1.5, 2)
+PADDING = 1  # Transparent pixels between packed sprites
+MAX_PAGE_WIDTH = 4096  # Widest page worth producing, unless a single sprite is wider
+
+# name -> (page, source file, size drawn at the base resolution or None for the source size)
+# The "ui" page is what the menu needs before the first frame, "game" loads in the background
+SPRITES = {
+    "sound_on": ("ui", f"{ASSET_DIR}/sound_on.jpg", (30, 30)),
+    "sound_off": ("ui", f"{ASSET_DIR}/sound_off.jpg", (30, 30)),
+    "back_arrow": ("ui", f"{ASSET_DIR}/back_arrow.jpg", (30, 30)),
+}
+SPRITES.update({f"hangman{i}": ("game", f"{ASSET_DIR}/hangman{i}.png", None) for i in range(MAX_TRIES + 1)})
+SPRITES.update({f"win_{i}": ("game", f"{ASSET_DIR}/win_{i}.png", None) for i in range(2)})
+
+
+def best_scale(window_size, scales=SCALES):
+    """The pre-scaled variant closest to how much larger the window is than the base resolution"""
+    factor = min(window_size[0] / BASE_RESOLUTION[0], window_size[1] / BASE_RESOLUTION[1])
+    return min(scales, key=lambda scale: abs(scale - factor))
+
+
+def page_file(path, page, scale):
+    stem = os.path.splitext(path)[0]
+    return f"{stem}-{page}@{scale:g}x.png"
+
+
+# --- Build Step ---
+def trim(image, size):
+    """Returns the visible pixels of a source image at its drawn size, and their offset"""
+    if size is not None and image.get_size() != tuple(size):
+        image = pygame.transform.scale(image, size)  # Same filter the game used when scaling at runtime
+    rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+    rgba.blit(image, (0, 0))
+    bounds = rgba.get_bounding_rect()
+    return rgba.subsurface(bounds).copy(), bounds.topleft, rgba.get_size()
+
+
+def shelves(pieces, order, width):
+    """Positions for order in shelves of the given width, and the height they use"""
+    positions = {}
+    x = y = shelf = 0
+    for name in order:
+        w, h = pieces[name].get_size()
+        if x + w > width:
+            x, y, shelf = 0, y + shelf + PADDING, 0
+        positions[name] = (x, y)
+        x += w + PADDING
+        shelf = max(shelf, h)
+    return positions, y + shelf
+
+
+def pack(pieces):
+    """Shelf-packs {name: surface}, tallest first, at the width using the least page area"""
+    order = sorted(pieces, key=lambda name: (-pieces[name].get_height(), name))
+    widest = max(piece.get_width() for piece in pieces.values())
+    total = sum(piece.get_width() + PADDING for piece in pieces.values())
+    widths = range(widest, max(widest, min(total, MAX_PAGE_WIDTH)) + 1, 8)
+    layouts = [(width, *shelves(pieces, order, width)) for width in widths]
+    width, positions, height = min(layouts, key=lambda layout: (layout[0] * layout[2], layout[0]))
+    page = pygame.Surface((width, max(height, 1)), pygame.SRCALPHA, 32)
+    page.fill((0, 0, 0, 0))
+    for name, position in positions.items():
+        page.blit(pieces[name], position)
+    return page, positions
+
+
+def build_pages(sprites=SPRITES, scales=SCALES, pages=None):
+    """Returns {(page, scale): (surface, {name: [x, y, w, h, offset x, offset y, full w, full h]})}"""
+    trimmed = {}
+    for name, (page, source, size) in sprites.items():
+        if pages is None or page in pages:
+            trimmed[name] = (page, *trim(pygame.image.load(source), size))
+    built = {}
+    for scale in scales:
+        for page in sorted({entry[0] for entry in trimmed.values()}):
+            pieces = {}
+            entries = {}
+            for name, (sprite_page, image, offset, full) in trimmed.items():
+                if sprite_page != page:
+                    continue
+                if scale != 1:
+                    w, h = image.get_size()
+                    image = pygame.transform.smoothscale(image, (max(1, round(w * scale)), max(1, round(h * scale))))
+                    offset = (round(offset[0] * scale), round(offset[1] * scale))
+                    full = (round(full[0] * scale), round(full[1] * scale))
+                pieces[name] = image
+                entries[name] = [*offset, *full]
+            surface, positions = pack(pieces)
+            built[(page, scale)] = (surface, {name: [*positions[name], *pieces[name].get_size(), *entries[name]]
+                                              for name in pieces})
+    return built
+
+
+def read_layout(path=ATLAS_FILE):
+    """The layout written by build_atlas, or None if it is missing or from another version"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        layout = json.load(f)
+    return layout if layout.get("version") == VERSION else None
+
+
+def build_atlas(path=ATLAS_FILE, sprites=SPRITES, scales=SCALES, pages=None):
+    """Writes one PNG per (page, scale) and the JSON layout describing them; returns the page count.
+    With pages given, only those are rebuilt and the other pages' layout is kept"""
+    built = build_pages(sprites, scales, pages)
+    layout = (read_layout(path) if pages is not None else None) or {
+        "version": VERSION, "base": list(BASE_RESOLUTION), "pages": {}}
+    for (page, scale), (surface, entries) in built.items():
+        image = page_file(path, page, scale)
+        pygame.image.save(surface, image)
+        layout["pages"].setdefault(page, {})[f"{scale:g}"] = {
+            "image": os.path.basename(image), "size": list(surface.get_size()), "sprites": entries}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(layout, f, indent=1)
+    os.replace(tmp_path, path)
+    return len(built)
+
+
+def is_stale(path=ATLAS_FILE, sprites=SPRITES, scales=SCALES, pages=None):
+    """True if any of the pages (all by default) is missing a sprite or is older than a source image"""
+    layout = read_layout(path)
+    if layout is None:
+        return True
+    for name, (page, source, _) in sprites.items():
+        if pages is not None and page not in pages:
+            continue
+        for scale in scales:
+            info = layout["pages"].get(page, {}).get(f"{scale:g}")
+            if info is None or name not in info["sprites"]:
+                return True
+            image = os.path.join(os.path.dirname(path), info["image"])
+            if not os.path.exists(image) or (os.path.exists(source)
+                                             and os.path.getmtime(source) > os.path.getmtime(image)):
+                return True
+    return False
+
+
+# --- Atlas Reader ---
+class Sprite:
+    """Subsurface view of an atlas page holding a trimmed sprite"""
+    __slots__ = ("surface", "offset", "size")
+
+    def __init__(self, surface, offset, size):
+        self.surface = surface
+        self.offset = offset  # Where the trimmed pixels sit inside the untrimmed image
+        self.size = size  # Untrimmed size, what the source image measured at this scale
+
+    def get_rect(self, **kwargs):
+        """Rect of the untrimmed image, positioned like Surface.get_rect(center=...)"""
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    @property
+    def bounds(self):
+        """Visible area relative to the untrimmed image's top-left, like Surface.get_bounding_rect"""
+        return pygame.Rect(self.offset, self.surface.get_size())
+
+    def draw(self, surface, position):
+        """Blits as if the untrimmed image were drawn at position"""
+        surface.blit(self.surface, (position[0] + self.offset[0], position[1] + self.offset[1]))
+
+
+class AtlasPage:
+    """One display-format page surface and the Sprites that view into it"""
+
+    def __init__(self, surface, entries, scale=1):
+        self.surface = surface
+        self.scale = scale
+        self.sprites = {name: Sprite(surface.subsurface(x, y, w, h), (ox, oy), (fw, fh))
+                        for name, (x, y, w, h, ox, oy, fw, fh) in entries.items()}
+
+    def __getitem__(self, name):
+        return self.sprites[name]
+
+    def __contains__(self, name):
+        return name in self.sprites
+
+    def nbytes(self):
+        return self.surface.get_pitch() * self.surface.get_height()
+
+
+def load_page(page, scale=1, path=ATLAS_FILE):
+    """Loads an atlas page at a pre-scaled variant, building just that variant first if it is missing or stale;
+    the other pages and scales are left to their own first use or to an explicit build"""
+    if is_stale(path, scales=(scale,), pages={page}):
+        try:
+            build_atlas(path, scales=(scale,), pages={page})
+        except OSError:  # Read-only install: pack in memory for this run
+            surface, entries = build_pages(scales=(scale,), pages={page})[(page, scale)]
+            return AtlasPage(surface.convert_alpha(), entries, scale)
+    with open(path) as f:
+        info = json.load(f)["pages"][page][f"{scale:g}"]
+    image = os.path.join(os.path.dirname(path), info["image"])
+    return AtlasPage(pygame.image.load(image).convert_alpha(), info["sprites"], scale)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack the game sprites into texture atlas pages")
+    parser.add_argument("--output", default=ATLAS_FILE)
+    parser.add_argument("--scales", type=float, nargs="+", default=list(SCALES))
+    args = parser.parse_args(argv)
+
+    count = build_atlas(args.output, scales=tuple(args.scales))
+    with open(args.output) as f:
+        layout = json.load(f)
+    for page, variants in layout["pages"].items():
+        for scale, info in variants.items():
+            print(f"{page:<5} @{scale}x {info['size'][0]}x{info['size'][1]} "
+                  f"{len(info['sprites'])} sprites -> {info['image']}")
+    print(f"Wrote {count} pages and {args.output}")
+
+
+if __name__ == "__main__":
+    main()
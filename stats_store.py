@@ -0,0 +1,288 @@
+# stats_store.py
+# SQLite (WAL mode) record of every finished game and its guesses, written in batches off the render thread
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from batch_writer import BatchWriter
+from log_analytics import DEFAULT_LOG, LogAnalytics
+
+STATS_DB = "game_stats.db"
+BATCH_SIZE = 64  # Games committed per transaction
+FLUSH_INTERVAL = 1.0  # Seconds a finished game may wait before being committed
+HARDEST_MIN_GAMES = 3  # Words need this many games to appear among the hardest
+# The writer thread and readers need one database, so ":memory:" means a temporary file deleted on close
+TEMPORARY = ":memory:"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished REAL NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    word TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_word ON games (word);
+CREATE INDEX IF NOT EXISTS games_category ON games (category, difficulty);
+CREATE INDEX IF NOT EXISTS games_difficulty ON games (difficulty);
+CREATE TABLE IF NOT EXISTS guesses (
+    game_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    letter TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+-- Running totals updated in the same transaction as the games, so summaries never scan games
+CREATE TABLE IF NOT EXISTS group_totals (
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    PRIMARY KEY (category, difficulty)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS word_totals (
+    word TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    guesses INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS word_totals_category ON word_totals (category);
+CREATE INDEX IF NOT EXISTS word_totals_hardness ON word_totals (CAST(wrong AS REAL) / games);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    imported REAL NOT NULL
+);
+"""
+
+UPSERT_GROUP = """
+INSERT INTO group_totals VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (category, difficulty) DO UPDATE SET games = games + excluded.games, wins = wins + excluded.wins,
+    wrong = wrong + excluded.wrong, guesses = guesses + excluded.guesses
+"""
+UPSERT_WORD = """
+INSERT INTO word_totals VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (word) DO UPDATE SET games = games + excluded.games, wins = wins + excluded.wins,
+    wrong = wrong + excluded.wrong, guesses = guesses + excluded.guesses
+"""
+
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=10)
+    db.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer thread, or each other
+    db.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; a power cut may lose the last batch
+    db.executescript(SCHEMA)
+    return db
+
+
+def write_games(db, games):
+    """Inserts (finished, category, difficulty, word, won, wrong, [(letter, correct)], source) rows
+    and folds them into the running totals, all in one transaction"""
+    groups = {}
+    words = {}
+    with db:
+        for finished, category, difficulty, word, won, wrong, letters, source in games:
+            game_id = db.execute("INSERT INTO games (finished, category, difficulty, word, won, wrong, guesses, "
+                                 "source) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (finished, category, difficulty, word, int(won), wrong, len(letters),
+                                  source)).lastrowid
+            db.executemany("INSERT INTO guesses VALUES (?, ?, ?, ?)",
+                           [(game_id, seq, letter, int(correct)) for seq, (letter, correct) in enumerate(letters)])
+            for totals, key in ((groups, (category, difficulty)), (words, (word, category))):
+                stats = totals.setdefault(key, [0, 0, 0, 0])
+                stats[0] += 1
+                stats[1] += int(won)
+                stats[2] += wrong
+                stats[3] += len(letters)
+        db.executemany(UPSERT_GROUP, [(*key, *stats) for key, stats in groups.items()])
+        db.executemany(UPSERT_WORD, [(*key, *stats) for key, stats in words.items()])
+
+
+# --- Store ---
+class StatsStore:
+    """Queues finished games for a background writer; summaries are read on the calling thread"""
+
+    def __init__(self, path=STATS_DB):
+        self.temporary = path == TEMPORARY
+        if self.temporary:
+            handle, path = tempfile.mkstemp(prefix="game_stats-", suffix=".db")
+            os.close(handle)
+        self.path = path
+        self.writer = BatchWriter("StatsStore", self._write, BATCH_SIZE, FLUSH_INTERVAL, self._open, self._close)
+        self.write_db = None  # The writer thread's connection
+        self.reader = None  # Connection of the thread reading summaries, opened on first use
+
+    def record_game(self, category, difficulty, word, won, wrong, letters, source="game"):
+        """Queues a finished game and its [(letter, correct)] guesses, never touches the disk"""
+        self.writer.put((time.time(), category, difficulty or "unknown", word, won, wrong, list(letters), source))
+
+    def flush(self):
+        """Blocks until every game queued so far is committed (or dropped, see BatchWriter.flush)"""
+        return self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        if self.temporary:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+
+    def _open(self):
+        self.write_db = connect(self.path)
+
+    def _close(self):
+        self.write_db.close()
+        self.write_db = None
+
+    def _write(self, batch):
+        write_games(self.write_db, batch)
+
+    # --- Queries ---
+    def _db(self):
+        if self.reader is None:
+            self.reader = connect(self.path)
+        return self.reader
+
+    def summary(self, top=5):
+        """Totals, per category/difficulty results and the hardest words, from the running totals"""
+        db = self._db()
+        groups = [dict(zip(("category", "difficulty", "games", "wins", "wrong", "guesses"), row)) for row in
+                  db.execute("SELECT * FROM group_totals ORDER BY category, difficulty")]
+        totals = {"games": 0, "wins": 0, "wrong": 0, "guesses": 0}
+        for group in groups:
+            for key in totals:
+                totals[key] += group[key]
+        hardest = [dict(zip(("word", "category", "games", "wins", "avg_wrong"), row)) for row in db.execute(
+            "SELECT word, category, games, wins, CAST(wrong AS REAL) / games FROM word_totals "
+            "WHERE games >= ? ORDER BY CAST(wrong AS REAL) / games DESC LIMIT ?", (HARDEST_MIN_GAMES, top))]
+        return {"totals": totals, "groups": groups, "hardest": hardest}
+
+    def word_stats(self, word):
+        """Games, wins and average wrong guesses for one word, through the per-word index"""
+        games, wins, avg_wrong = self._db().execute(
+            "SELECT count(*), coalesce(sum(won), 0), avg(wrong) FROM games WHERE word = ?", (word,)).fetchone()
+        return {"word": word, "games": games, "wins": wins, "avg_wrong": avg_wrong or 0.0}
+
+    def query(self, category=None, difficulty=None):
+        """Totals over the groups matching a category and/or difficulty"""
+        clauses = [(column, value) for column, value in (("category", category), ("difficulty", difficulty))
+                   if value is not None]
+        where = " AND ".join(f"{column} = ?" for column, _ in clauses) or "1"
+        games, wins, wrong = self._db().execute(
+            f"SELECT coalesce(sum(games), 0), coalesce(sum(wins), 0), coalesce(sum(wrong), 0) FROM group_totals "
+            f"WHERE {where}", [value for _, value in clauses]).fetchone()
+        return {"games": games, "wins": wins, "wrong": wrong}
+
+
+# --- Log Importer ---
+class LogImporter(LogAnalytics):
+    """Replays game_log.txt with the log_analytics parser and keeps every finished game"""
+
+    def __init__(self, log_path=DEFAULT_LOG):
+        super().__init__(log_path, checkpoint_path=None)
+        self.finished = []
+        self.line_time = None
+
+    def parse_line(self, line):
+        try:
+            if line.startswith("["):
+                self.line_time = datetime.strptime(line[1:20], "%Y-%m-%d %H:%M:%S").timestamp()
+            elif line.startswith("{") and '"time"' in line:
+                self.line_time = datetime.fromisoformat(line.split('"time": "', 1)[1][:19]).timestamp()
+        except ValueError:
+            pass
+        super().parse_line(line)
+
+    def start_session(self, category, word, difficulty=None):
+        super().start_session(category, word, difficulty)
+        self.session.letters_in_order = []
+        self.session.last_time = self.line_time
+
+    def record_guess(self, letter, correct):
+        session = self.session
+        guessed = len(session.guessed) if session else 0
+        super().record_guess(letter, correct)
+        if session is not None and len(session.guessed) > guessed:
+            session.letters_in_order.append((letter, correct))
+            session.last_time = self.line_time  # The game finished on its last accepted guess
+
+    def finish_session(self):
+        session = self.session
+        super().finish_session()
+        if session is not None and session.outcome() != "abandoned":
+            self.finished.append((session.last_time or 0.0, session.category, session.difficulty, session.word,
+                                  session.outcome() == "win", session.wrong, session.letters_in_order, "import"))
+
+
+def import_log(log_path=DEFAULT_LOG, db_path=STATS_DB, force=False):
+    """One-time import of a game log; returns the number of games added (0 if it was imported before)"""
+    db = connect(db_path)
+    try:
+        done = db.execute("SELECT offset FROM imports WHERE path = ?", (os.path.abspath(log_path),)).fetchone()
+        if done and not force:
+            return 0
+        importer = LogImporter(log_path)
+        importer.process()
+        importer.finish_session()  # The last game in the file ended with the log
+        for start in range(0, len(importer.finished), 10_000):
+            write_games(db, importer.finished[start:start + 10_000])
+        with db:
+            db.execute("INSERT OR REPLACE INTO imports VALUES (?, ?, ?)",
+                       (os.path.abspath(log_path), importer.offset, time.time()))
+        return len(importer.finished)
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the game statistics database or import a game log")
+    parser.add_argument("--db", default=STATS_DB)
+    parser.add_argument("--import", dest="import_log", metavar="LOG", help="Import a game_log.txt once")
+    parser.add_argument("--force", action="store_true", help="Import even if this log was imported before")
+    parser.add_argument("--word", help="Show the results for one word")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.import_log:
+        start = time.perf_counter()
+        count = import_log(args.import_log, args.db, args.force)
+        if count == 0 and not args.force:
+            print(f"{args.import_log} was already imported (use --force to import it again)")
+        else:
+            print(f"Imported {count} games from {args.import_log} in {time.perf_counter() - start:.2f}s")
+    store = StatsStore(args.db)
+    if args.word:
+        stats = store.word_stats(args.word)
+        print(f"{stats['word']}: games={stats['games']} wins={stats['wins']} avg_wrong={stats['avg_wrong']:.2f}")
+        return
+    start = time.perf_counter()
+    summary = store.summary(args.top)
+    elapsed = time.perf_counter() - start
+    totals = summary["totals"]
+    rate = totals["wins"] / totals["games"] if totals["games"] else 0.0
+    print(f"Games: {totals['games']}  Win rate: {rate:.1%}  (summary read in {elapsed * 1e3:.2f}ms)")
+    print("\nBy category/difficulty:")
+    for group in summary["groups"]:
+        print(f"  {group['category'] + '/' + group['difficulty']:<20} games={group['games']:<6} "
+              f"win_rate={group['wins'] / group['games']:.1%} avg_wrong={group['wrong'] / group['games']:.2f}")
+    print(f"\nHardest words (at least {HARDEST_MIN_GAMES} games):")
+    for word in summary["hardest"]:
+        print(f"  {word['word']:<20} {word['category']:<8} games={word['games']:<5} avg_wrong={word['avg_wrong']:.2f}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# test_batch_writer.py
+# The queue-draining thread shared by the game log and the stats store
+from batch_writer import BatchWriter
+
+
+def test_flush_writes_everything_queued():
+    batches = []
+    writer = BatchWriter("test", batches.append, 3, 60.0)
+    for i in range(7):
+        writer.put((i,))
+    assert writer.flush()
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    writer.close()
+
+
+def test_failing_sink_drops_batches_without_hanging_flush(capsys):
+    def write(batch):
+        if batch[0] == ("bad",):
+            raise OSError("disk full")
+        written.extend(batch)
+
+    written = []
+    writer = BatchWriter("test", write, 1, 60.0)
+    writer.put(("bad",))
+    writer.put(("good",))
+    assert writer.flush()
+    assert written == [("good",)]
+    assert (writer.dropped, str(writer.error)) == (1, "disk full")
+    assert "disk full" in capsys.readouterr().err
+    writer.close()
+
+
+def test_failed_open_is_retried():
+    attempts = []
+
+    def open_sink():
+        attempts.append(1)
+        if len(attempts) <= 2:  # At thread start and for the first batch
+            raise OSError("database is locked")
+
+    written = []
+    writer = BatchWriter("test", written.extend, 1, 60.0, on_open=open_sink)
+    writer.put(("lost",))
+    assert writer.flush()
+    writer.put(("kept",))
+    assert writer.flush()
+    assert (written, writer.dropped) == ([("kept",)], 1)
+    writer.close()
@@ -0,0 +1,134 @@
+# test_hangman_engine.py
+# Game rules without a display: GameState bookkeeping and the word strategies
+import json
+import random
+from hangman_engine import (MAX_TRIES, TABLE_VERSION, DifficultyTable, GameState, HangmanEngine,
+                            RandomCategoryStrategy, ShuffleBagStrategy, load_difficulty_table, select_answers)
+from word_corpus import CorpusIndex, build_index, load_sources
+
+WORD_DATA = {
+    "fruit": {"easy": ["apple"], "medium": ["mango"], "hard": ["kiwi"]},
+    "riddle": {"easy": [["What has keys but no locks?", "piano"]], "medium": [], "hard": []},
+}
+
+
+def test_correct_guess_reveals_every_position():
+    state = GameState("banana")
+    assert state.guess("a") is True
+    assert state.chars == ["_", "a", "_", "a", "_", "a"]
+    assert state.display == "_ a _ a _ a"
+    assert state.reveal_mask == 0b101010
+    assert state.remaining == 2
+
+
+def test_wrong_guess_counts_once():
+    state = GameState("kiwi")
+    assert state.guess("z") is False
+    assert state.guess("z") is None
+    assert state.wrong == 1
+    assert state.wrong_letters == "z"
+    assert state.guessed == "z"
+
+
+def test_repeats_and_non_letters_are_ignored():
+    state = GameState("kiwi")
+    state.guess("k")
+    for letter in ("k", "K", "1", "", "ab"):
+        assert state.guess(letter) is None
+    assert state.guessed == "k"
+    assert state.guessed_mask == 1 << (ord("k") - 97)
+
+
+def test_non_letters_start_revealed():
+    state = GameState("beluga whale")
+    assert state.chars[6] == " "
+    assert state.reveal_mask == 1 << 6
+    for letter in "belugawh":
+        state.guess(letter)
+    assert state.has_won()
+    assert state.display == "b e l u g a   w h a l e"
+
+
+def test_loses_after_max_tries():
+    state = GameState("a")
+    for letter in "bcdefg"[:MAX_TRIES]:
+        assert not state.has_lost()
+        state.guess(letter)
+    assert state.has_lost()
+    assert not state.has_won()
+
+
+def test_no_guesses_once_decided():
+    lost = GameState("a")
+    for letter in "bcdefg"[:MAX_TRIES]:
+        lost.guess(letter)
+    assert lost.guess("h") is None
+    assert lost.guess("a") is None
+    assert lost.wrong == MAX_TRIES
+    won = GameState("kiwi")
+    for letter in "kiw":
+        won.guess(letter)
+    assert won.guess("z") is None
+    assert (won.wrong, won.guessed) == (0, "kiw")
+
+
+def test_snapshot_round_trip():
+    state = GameState("mango")
+    for letter in "mzo":
+        state.guess(letter)
+    restored = GameState.from_snapshot(state.snapshot())
+    assert restored == state
+    assert (restored.display, restored.wrong, restored.guessed) == (state.display, state.wrong, state.guessed)
+
+
+def test_engine_plays_riddles_from_word_data():
+    engine = HangmanEngine(RandomCategoryStrategy("riddle", "easy", random.Random(1)), "riddle", "easy",
+                           word_data=WORD_DATA)
+    engine.reset_game()
+    assert (engine.category, engine.answer, engine.hint) == ("riddle", "piano", "What has keys but no locks?")
+    for letter in "pian":
+        engine.guess(letter)
+    assert not engine.has_won()
+    engine.guess("o")
+    assert engine.has_won()
+
+
+def test_seeded_strategy_is_reproducible():
+    picks = [[RandomCategoryStrategy("words", None, random.Random(seed)).select_word(WORD_DATA) for _ in range(5)]
+             for seed in (7, 7)]
+    assert picks[0] == picks[1]
+
+
+def test_select_answers_filters_category_and_difficulty():
+    assert select_answers(WORD_DATA, "words", "easy") == ["apple"]
+    assert select_answers(WORD_DATA, "riddle") == ["piano"]
+    assert select_answers(WORD_DATA, "fruit", "medium") == ["mango"]
+    assert sorted(select_answers(WORD_DATA)) == ["apple", "kiwi", "mango", "piano"]
+
+
+def test_shuffle_bag_draws_the_calibrated_bucket_without_repeats(tmp_path):
+    words = {"fruit": {"easy": ["apple", "fig", "pear"], "medium": ["mango"], "hard": ["kiwi"]}}
+    (tmp_path / "words.json").write_text(json.dumps(words))
+    (tmp_path / "riddles.json").write_text(json.dumps({}))
+    path = str(tmp_path / "words.idx")
+    build_index(load_sources(tmp_path / "words.json", tmp_path / "riddles.json"), path)
+    index = CorpusIndex(path)
+    table = DifficultyTable({"fruit": {"apple": "hard", "kiwi": "easy", "mango": "easy"}})
+    strategy = ShuffleBagStrategy("words", "easy", random.Random(2), table=table)
+    drawn = [strategy.select_word(index)[1] for _ in range(4)]
+    assert sorted(drawn) == ["fig", "kiwi", "mango", "pear"]  # apple moved to hard, nothing repeats
+    assert table.ranges(index, ["fruit"], "hard") == [(0, 1)]
+    index.close()
+
+
+def test_unusable_difficulty_table_falls_back_to_none(tmp_path):
+    path = tmp_path / "difficulty_table.json"
+    assert load_difficulty_table(str(path)) is None
+    entries = {"kiwi": [1, 0, 0, 0.5, "hard"]}
+    table = {"version": TABLE_VERSION, "categories": {"fruit": {"pool": 1, "entries": entries}}}
+    path.write_text(json.dumps(table))
+    assert load_difficulty_table(str(path)).levels == {"fruit": {"kiwi": "hard"}}
+    for broken in (json.dumps(table)[:40], json.dumps(dict(table, version=TABLE_VERSION + 1)),
+                   json.dumps({"version": TABLE_VERSION, "categories": []})):
+        path.write_text(broken)
+        assert load_difficulty_table(str(path)) is None
@@ -0,0 +1,71 @@
+# test_letter_solver.py
+# Candidate filtering and suggestions against a brute-force reading of the rules
+import pytest
+
+np = pytest.importorskip("numpy")  # Optional, like the Hint button
+import letter_solver
+from hangman_engine import GameState
+
+WORDS = ["apple", "angle", "ample", "eagle", "mango", "melon", "lemon", "kiwi", "plum", "pear", "ice cream"]
+
+
+def matching(solver_words, pattern, guessed, candidates):
+    """Words of len(pattern) whose bit is set in the candidates bitset, in solver order"""
+    words = [word for word in dict.fromkeys(solver_words) if len(word) == len(pattern)]
+    bits = np.unpackbits(candidates.view(np.uint8), bitorder="little")[:len(words)]
+    return [word for word, bit in zip(words, bits) if bit]
+
+
+def brute_force(pattern, guessed):
+    """Words consistent with a board: shown letters in place, no guessed letter anywhere hidden"""
+    result = []
+    for word in WORDS:
+        if len(word) != len(pattern):
+            continue
+        state = GameState(word)
+        for letter in guessed:
+            state.guess(letter)
+        if "".join(state.chars) == pattern:
+            result.append(word)
+    return result
+
+
+@pytest.mark.parametrize("pattern, guessed", [
+    ("_____", ""),
+    ("a___e", "ae"),
+    ("a___e", "aep"),
+    ("__l__", "lz"),
+    ("____", "x"),
+    ("___ _____", ""),
+    ("i__ _____", "i"),
+])
+def test_candidates_match_the_rules(pattern, guessed):
+    solver = letter_solver.LetterSolver(WORDS)
+    candidates = solver.candidates(pattern, guessed)
+    assert matching(WORDS, pattern, guessed, candidates) == brute_force(pattern, guessed)
+
+
+def test_unknown_length_has_no_candidates():
+    solver = letter_solver.LetterSolver(WORDS)
+    assert solver.candidates("_" * 12, "") is None
+    assert solver.analyze("_" * 12) == (None, 0)
+
+
+def test_suggests_the_most_common_unguessed_letter():
+    solver = letter_solver.LetterSolver(WORDS)
+    letter, remaining = solver.analyze("a___e", "ae")
+    assert remaining == 3  # apple, angle, ample
+    assert letter == "l"  # In all three; p and m/n/g are in fewer
+    assert solver.suggest("a__le", "ael") in {"p", "m", "n", "g"}
+
+
+def test_suggest_for_reads_a_game_state():
+    solver = letter_solver.LetterSolver(WORDS)
+    state = GameState("kiwi")
+    state.guess("i")
+    assert solver.suggest_for(state) in {"k", "w"}
+
+
+def test_no_suggestion_once_solved():
+    solver = letter_solver.LetterSolver(WORDS)
+    assert solver.suggest("plum", "plum") is None
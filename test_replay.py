@@ -0,0 +1,86 @@
+# test_replay.py
+# Replay file format: payload encodings, the seek index and recovery from a truncated file
+import pytest
+from replay import (HEADER, ReplayReader, ReplayWriter, decode_event, decode_keyframe, decode_state, encode_event,
+                    encode_keyframe, encode_state)
+
+MENU = ("menu", "", "", "", "", 0, True)
+
+
+def game_state(answer, guessed="", wrong=0):
+    return ("game", "words", "easy", answer, guessed, wrong, True)
+
+
+def test_state_round_trip():
+    state = ("game", "riddle", "hard", "ice cream", "iec", 1, False)
+    assert decode_state(encode_state(state)) == state
+
+
+def test_keyframe_round_trip():
+    payload = encode_keyframe(3, game_state("kiwi"), ("fruit", "fruit"))
+    assert decode_keyframe(payload) == (3, game_state("kiwi"), ("fruit", "fruit"))
+
+
+def test_event_round_trip():
+    pygame = pytest.importorskip("pygame")
+    key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_e, mod=0, unicode="e")
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(120, 340), button=1)
+    decoded = decode_event(encode_event(key))
+    assert (decoded.type, decoded.key, decoded.unicode) == (pygame.KEYDOWN, pygame.K_e, "e")
+    decoded = decode_event(encode_event(click))
+    assert (decoded.type, decoded.pos, decoded.button) == (pygame.MOUSEBUTTONDOWN, (120, 340), 1)
+
+
+def record_session(path, close=True):
+    """Two games: kiwi with a wrong guess, then plum; idle frames in between are not recorded"""
+    writer = ReplayWriter(path, seed=42)
+    writer.end_frame(MENU, 0, ("", ""), True, 0.001, False)
+    writer.end_frame(MENU, 0, ("", ""), False, 0.0, False)  # Nothing happened
+    writer.end_frame(game_state("kiwi"), 1, ("fruit", "fruit"), True, 0.002, True)
+    writer.end_frame(game_state("kiwi", "z", 1), 1, ("fruit", "fruit"), True, 0.001, True)
+    writer.end_frame(game_state("plum"), 2, ("fruit", "fruit"), True, 0.002, True)
+    if close:
+        writer.close()
+    else:
+        writer.file.close()
+
+
+def test_reader_replays_recorded_frames(tmp_path):
+    path = str(tmp_path / "session.rpl")
+    record_session(path)
+    reader = ReplayReader(path)
+    assert reader.seed == 42
+    frames = list(reader.frames())
+    assert [frame for frame, _, _, _ in frames] == [0, 2, 3, 4]
+    assert [state for _, _, state, _ in frames] == [MENU, game_state("kiwi"), game_state("kiwi", "z", 1),
+                                                    game_state("plum")]
+    assert frames[1][3] == 2000  # Microseconds
+
+
+def test_index_points_at_keyframes(tmp_path):
+    path = str(tmp_path / "session.rpl")
+    record_session(path)
+    reader = ReplayReader(path)
+    assert [(game, frame) for game, frame, _ in reader.index] == [(1, 2), (2, 4)]
+    _, games, state, word = reader.keyframe(2)
+    assert (games, state, word) == (2, game_state("plum"), ("fruit", "fruit"))
+    assert reader.words_from(1) == [("fruit", "kiwi", "fruit"), ("fruit", "plum", "fruit")]
+    with pytest.raises(KeyError):
+        reader.keyframe(5)
+
+
+def test_index_is_rebuilt_without_a_trailer(tmp_path):
+    path = tmp_path / "crashed.rpl"
+    record_session(str(path), close=False)
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])  # Cut inside the last record
+    reader = ReplayReader(str(path))
+    assert [(game, frame) for game, frame, _ in reader.index] == [(1, 2), (2, 4)]
+    assert [frame for frame, _, _, _ in reader.frames()] == [0, 2, 3]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.rpl"
+    path.write_bytes(b"\0" * HEADER.size)
+    with pytest.raises(ValueError):
+        ReplayReader(str(path))
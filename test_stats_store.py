@@ -0,0 +1,69 @@
+# test_stats_store.py
+# Game rows, guesses and the running totals kept beside them
+import os
+from datetime import datetime
+from stats_store import LogImporter, StatsStore, connect, write_games
+
+
+def game(word, won, wrong, letters, category="fruit", difficulty="easy"):
+    return (0.0, category, difficulty, word, won, wrong, letters, "test")
+
+
+def test_write_games_keeps_totals_in_step(tmp_path):
+    db = connect(str(tmp_path / "stats.db"))
+    write_games(db, [game("kiwi", True, 1, [("k", True), ("z", False), ("i", True), ("w", True)]),
+                     game("kiwi", False, 6, [(letter, False) for letter in "abcdef"]),
+                     game("red", True, 0, [("r", True), ("e", True), ("d", True)], "color", "easy")])
+    write_games(db, [game("plum", True, 2, [("p", True), ("x", False), ("y", False), ("l", True), ("u", True),
+                                            ("m", True)], difficulty="hard")])
+    groups = {(category, difficulty): rest for category, difficulty, *rest in
+              db.execute("SELECT * FROM group_totals")}
+    assert groups == {("fruit", "easy"): [2, 1, 7, 10], ("color", "easy"): [1, 1, 0, 3],
+                      ("fruit", "hard"): [1, 1, 2, 6]}
+    assert db.execute("SELECT games, wins, wrong, guesses FROM word_totals WHERE word = 'kiwi'").fetchone() == \
+        (2, 1, 7, 10)
+    # The totals agree with a scan of the raw rows
+    assert db.execute("SELECT count(*), sum(won), sum(wrong), sum(guesses) FROM games").fetchone() == (4, 3, 9, 19)
+    assert db.execute("SELECT count(*) FROM guesses").fetchone() == (19,)
+    first_game = db.execute("SELECT min(id) FROM games").fetchone()[0]
+    assert db.execute("SELECT letter, correct FROM guesses WHERE game_id = ? ORDER BY seq",
+                      (first_game,)).fetchall() == [("k", 1), ("z", 0), ("i", 1), ("w", 1)]
+    db.close()
+
+
+def test_store_summary_after_flush(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    for wrong in (6, 5, 6):
+        store.record_game("fruit", "hard", "kiwi", wrong < 6, wrong, [("z", False)] * wrong)
+    store.record_game("fruit", "easy", "fig", True, 0, [("f", True), ("i", True), ("g", True)])
+    store.flush()
+    summary = store.summary()
+    assert summary["totals"] == {"games": 4, "wins": 2, "wrong": 17, "guesses": 20}
+    assert [word["word"] for word in summary["hardest"]] == ["kiwi"]  # fig has fewer games than the minimum
+    assert store.word_stats("fig") == {"word": "fig", "games": 1, "wins": 1, "avg_wrong": 0.0}
+    assert store.query(difficulty="hard") == {"games": 3, "wins": 1, "wrong": 17}
+    store.close()
+
+
+def test_memory_store_shares_one_database():
+    store = StatsStore(":memory:")
+    store.record_game("fruit", "easy", "fig", True, 0, [("f", True), ("i", True), ("g", True)])
+    store.flush()
+    assert store.word_stats("fig") == {"word": "fig", "games": 1, "wins": 1, "avg_wrong": 0.0}
+    store.close()
+    assert not os.path.exists(store.path)
+
+
+def test_import_stamps_each_game_with_its_own_time(tmp_path):
+    log = tmp_path / "game_log.txt"
+    log.write_text("[2025-05-15 20:00:00] New game: Category=fruit, Word=fig, Difficulty=easy\n"
+                   "[2025-05-15 20:00:05] Correct guess: f\n"
+                   "[2025-05-15 20:00:06] Correct guess: i\n"
+                   "[2025-05-15 20:00:07] Correct guess: g\n"
+                   "[2025-05-15 21:30:00] New game: Category=fruit, Word=kiwi, Difficulty=easy\n")
+    importer = LogImporter(str(log))
+    importer.run(resume=False)
+    importer.finish_session()
+    # fig ended on its last guess, not when the next game started
+    assert [(game[0], game[3]) for game in importer.finished] == \
+        [(datetime(2025, 5, 15, 20, 0, 7).timestamp(), "fig")]
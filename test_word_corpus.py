@@ -0,0 +1,78 @@
+# test_word_corpus.py
+# Binary corpus index round trips and shuffle-bag draws
+import json
+import random
+import pytest
+from word_corpus import HEADER, MAGIC, VERSION, CorpusIndex, ShuffleBag, build_index, is_stale, load_sources
+
+
+@pytest.fixture
+def index(tmp_path):
+    words = {"fruit": {"easy": ["Apple", "apple", "fig"], "hard": ["Kiwi"]}, "color": {"easy": ["red"]}}
+    riddles = {"easy": [["What has keys but no locks?", "Piano"]], "hard": []}
+    (tmp_path / "words.json").write_text(json.dumps(words))
+    (tmp_path / "riddles.json").write_text(json.dumps(riddles))
+    path = str(tmp_path / "words.idx")
+    build_index(load_sources(tmp_path / "words.json", tmp_path / "riddles.json"), path)
+    corpus = CorpusIndex(path)
+    yield corpus
+    corpus.close()
+
+
+def test_index_matches_the_json_layout(index):
+    assert sorted(index) == ["color", "fruit", "riddle"]
+    assert list(index["fruit"]["easy"]) == ["apple", "fig"]  # Lowercased and deduplicated
+    assert list(index["fruit"]["hard"]) == ["kiwi"]
+    assert list(index["riddle"]["easy"]) == [["What has keys but no locks?", "piano"]]
+    assert list(index["riddle"]["hard"]) == []
+
+
+def test_entries_carry_their_category(index):
+    first, _ = index.groups["riddle"]["easy"]
+    assert index.entry(first) == ("riddle", "piano", "What has keys but no locks?")
+    first, _ = index.groups["color"]["easy"]
+    assert index.entry(first) == ("color", "red", "color")
+
+
+def test_ranges_filter_by_difficulty(index):
+    ids = [entry_id for first, count in index.ranges(["fruit", "color"], "easy")
+           for entry_id in range(first, first + count)]
+    assert sorted(index.entry(entry_id)[1] for entry_id in ids) == ["apple", "fig", "red"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.idx"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        CorpusIndex(str(path))
+
+
+@pytest.mark.parametrize("data", [b"", MAGIC, HEADER.pack(MAGIC, VERSION + 1, 0, 0)])
+def test_empty_short_and_other_version_indexes_are_stale(tmp_path, data):
+    path = tmp_path / "words.idx"
+    path.write_bytes(data)
+    assert is_stale(str(path), sources=())
+    with pytest.raises(ValueError):
+        CorpusIndex(str(path))
+
+
+def test_built_index_is_fresh(index):
+    assert not is_stale(index.path, sources=())
+
+
+def test_shuffle_bag_serves_everything_before_repeating():
+    bag = ShuffleBag([(0, 5), (10, 3)], random.Random(3))
+    for _ in range(4):
+        drawn = [bag.draw() for _ in range(8)]
+        assert sorted(drawn) == [0, 1, 2, 3, 4, 10, 11, 12]
+
+
+def test_shuffle_bag_does_not_repeat_across_refills():
+    bag = ShuffleBag([(0, 2)], random.Random(0))
+    drawn = [bag.draw() for _ in range(40)]
+    assert all(a != b for a, b in zip(drawn, drawn[1:]))
+
+
+def test_empty_bag_raises():
+    with pytest.raises(ValueError):
+        ShuffleBag([(0, 0)], random.Random()).draw()
@@ -0,0 +1,214 @@
+# word_corpus.py
+# Compiled, memory-mapped word/riddle index built from words.json and riddles.json
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping, Sequence
+
+WORDS_FILE = "words.json"
+RIDDLES_FILE = "riddles.json"
+CORPUS_INDEX = "words.idx"
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# Layout: header, group table, entry table, string blob (all little-endian)
+MAGIC = b"HIDX"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")  # magic, version, group count, entry count
+GROUP = struct.Struct("<IHIHII")  # category offset/len, difficulty offset/len, first entry, entry count
+ENTRY = struct.Struct("<IHIH")  # answer offset/len, hint offset/len
+
+
+# --- Build Step ---
+def load_sources(words_path=WORDS_FILE, riddles_path=RIDDLES_FILE):
+    """Returns {(category, difficulty): [(answer, hint), ...]} with duplicates removed"""
+    with open(words_path) as f:
+        words = json.load(f)
+    with open(riddles_path) as f:
+        riddles = json.load(f)
+    groups = {}
+    for category in sorted(words):
+        for difficulty, entries in words[category].items():
+            groups[(category, difficulty)] = [(word.lower(), category) for word in entries]
+    for difficulty, entries in riddles.items():
+        groups[("riddle", difficulty)] = [(answer.lower(), riddle) for riddle, answer in entries]
+    for key, entries in groups.items():
+        groups[key] = list(dict.fromkeys(entries))  # Keeps first occurrence order
+    return groups
+
+
+def build_index(groups, path=CORPUS_INDEX):
+    """Packs grouped (answer, hint) entries into the binary index at path"""
+    blob = bytearray()
+    strings = {}
+
+    def intern(text):
+        if text not in strings:
+            data = text.encode("utf-8")
+            strings[text] = (len(blob), len(data))
+            blob.extend(data)
+        return strings[text]
+
+    order = {difficulty: i for i, difficulty in enumerate(DIFFICULTIES)}
+    keys = sorted(groups, key=lambda k: (k[0] == "riddle", k[0], order.get(k[1], len(order)), k[1]))
+    group_table = bytearray()
+    entry_table = bytearray()
+    entry_count = 0
+    for category, difficulty in keys:
+        entries = groups[(category, difficulty)]
+        group_table += GROUP.pack(*intern(category), *intern(difficulty), entry_count, len(entries))
+        for answer, hint in entries:
+            entry_table += ENTRY.pack(*intern(answer), *intern(hint))
+        entry_count += len(entries)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(keys), entry_count))
+        f.write(group_table)
+        f.write(entry_table)
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return entry_count
+
+
+def is_stale(path=CORPUS_INDEX, sources=(WORDS_FILE, RIDDLES_FILE)):
+    """True if the index is missing, cut short, from another format version or older than a source"""
+    if not os.path.exists(path):
+        return True
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION):
+        return True
+    built = os.path.getmtime(path)
+    return any(os.path.exists(source) and os.path.getmtime(source) > built for source in sources)
+
+
+# --- Index Reader ---
+class CorpusIndex(Mapping):
+    """Read-only view of a compiled index, shaped like the dict from HangmanGame.load_words:
+    index[category][difficulty] is a sequence of words, or of [riddle, answer] pairs"""
+
+    def __init__(self, path=CORPUS_INDEX):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError if the file is empty
+        if len(self.data) < HEADER.size or HEADER.unpack_from(self.data, 0)[:2] != (MAGIC, VERSION):
+            self.data.close()
+            raise ValueError(f"{path} is not a version {VERSION} corpus index")
+        _, _, group_count, self.entry_count = HEADER.unpack_from(self.data, 0)
+        self.entries_start = HEADER.size + group_count * GROUP.size
+        self.blob_start = self.entries_start + self.entry_count * ENTRY.size
+        self.groups = {}  # category -> {difficulty: (first entry, count)}
+        self.group_starts = []
+        self.group_categories = []
+        for i in range(group_count):
+            cat_off, cat_len, diff_off, diff_len, first, count = GROUP.unpack_from(
+                self.data, HEADER.size + i * GROUP.size)
+            category = self._string(cat_off, cat_len)
+            self.groups.setdefault(category, {})[self._string(diff_off, diff_len)] = (first, count)
+            self.group_starts.append(first)
+            self.group_categories.append(category)
+
+    def _string(self, offset, length):
+        start = self.blob_start + offset
+        return self.data[start:start + length].decode("utf-8")
+
+    def entry(self, entry_id):
+        """Returns (category, answer, hint) for a global entry id"""
+        answer_off, answer_len, hint_off, hint_len = ENTRY.unpack_from(
+            self.data, self.entries_start + entry_id * ENTRY.size)
+        category = self.group_categories[bisect.bisect_right(self.group_starts, entry_id) - 1]
+        return category, self._string(answer_off, answer_len), self._string(hint_off, hint_len)
+
+    def ranges(self, categories, difficulty=None):
+        """Returns (first entry, count) for every matching group"""
+        return [span for category in categories
+                for diff, span in self.groups.get(category, {}).items()
+                if difficulty is None or diff == difficulty]
+
+    def __getitem__(self, category):
+        return {difficulty: GroupView(self, first, count)
+                for difficulty, (first, count) in self.groups[category].items()}
+
+    def __iter__(self):
+        return iter(self.groups)
+
+    def __len__(self):
+        return len(self.groups)
+
+    def close(self):
+        self.data.close()
+
+
+class GroupView(Sequence):
+    def __init__(self, index, first, count):
+        self.index = index
+        self.first = first
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        category, answer, hint = self.index.entry(self.first + i)
+        return [hint, answer] if category == "riddle" else answer
+
+
+# --- Shuffle Bag ---
+class ShuffleBag:
+    """Draws every id in the given ranges once, in random order, before repeating any"""
+
+    def __init__(self, ranges, rng):
+        self.ranges = ranges
+        self.rng = rng
+        self.ids = array("I")
+        self.remaining = 0
+        self.last = None
+
+    def refill(self):
+        self.ids = array("I")
+        for first, count in self.ranges:
+            self.ids.extend(range(first, first + count))
+        self.remaining = len(self.ids)
+        if self.remaining == 0:
+            raise ValueError("No entries to draw from")
+
+    def draw(self):
+        if self.remaining == 0:
+            self.refill()
+        # One step of a lazy Fisher-Yates shuffle
+        while True:
+            i = self.rng.randrange(self.remaining)
+            entry_id = self.ids[i]
+            # Avoid serving the last word of the previous bag first in the new one
+            if entry_id != self.last or self.remaining == 1:
+                break
+        self.remaining -= 1
+        self.ids[i] = self.ids[self.remaining]
+        self.ids[self.remaining] = entry_id
+        self.last = entry_id
+        return entry_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile words.json and riddles.json into a binary index")
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--riddles", default=RIDDLES_FILE)
+    parser.add_argument("--output", default=CORPUS_INDEX)
+    args = parser.parse_args(argv)
+
+    count = build_index(load_sources(args.words, args.riddles), args.output)
+    print(f"Wrote {count} entries to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()